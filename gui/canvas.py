@@ -105,13 +105,6 @@ class StarCanvas(tk.Canvas):
         if not self.graph:
             return
             
-        coordinate_groups = {}
-        for star in self.graph.get_all_stars():
-            coord_key = (star.coordinates['x'], star.coordinates['y'])
-            if coord_key not in coordinate_groups:
-                coordinate_groups[coord_key] = []
-            coordinate_groups[coord_key].append(star)
-        
         colors = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7"]
         
         for i, constellation in enumerate(self.graph.constellations):
@@ -124,8 +117,7 @@ class StarCanvas(tk.Canvas):
                 scaled_radius = base_radius + (star.radius * 10)
                 
                 fill_color = color
-                coord_key = (star.coordinates['x'], star.coordinates['y'])
-                if len(coordinate_groups[coord_key]) > 1:
+                if len(self.graph.get_stars_at_coordinates(star.coordinates['x'], star.coordinates['y'], 0)) > 1:
                     fill_color = "red"
                     scaled_radius += 3
                 
@@ -199,10 +191,15 @@ class StarCanvas(tk.Canvas):
             self.config(cursor="")
     
     def find_star_at_position(self, x, y, tolerance=15):
-        for star_id, star_data in self.star_objects.items():
-            distance = math.sqrt((star_data['x'] - x)**2 + (star_data['y'] - y)**2)
-            if distance <= tolerance:
-                return star_id
+        # Hit-test in map coordinates through the graph's spatial index
+        if not self.graph or self.scale_factor <= 0:
+            return None
+        stars = self.graph.get_stars_within((x - self.offset_x) / self.scale_factor,
+                                            (y - self.offset_y) / self.scale_factor,
+                                            tolerance / self.scale_factor)
+        for star in stars:
+            if star.id in self.star_objects:
+                return star.id
         return None
     
     def find_connection_at_position(self, x, y, tolerance=8):
@@ -268,15 +265,8 @@ class StarCanvas(tk.Canvas):
             x2, y2 = self.transform_coordinates(star2.coordinates['x'], star2.coordinates['y'])
             
             colors = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7"]
-            constellation = self.graph.get_constellation_for_star(star1.id)
-            color = colors[0]
-            
-            if constellation and self.graph.constellations:
-                try:
-                    index = self.graph.constellations.index(constellation)
-                    color = colors[index % len(colors)]
-                except:
-                    pass
+            index = self.graph.get_constellation_index(star1.id)
+            color = colors[index % len(colors)] if index is not None else colors[0]
             
             line_width = 2
             dash_pattern = None
@@ -384,9 +374,15 @@ class StarCanvas(tk.Canvas):
         if self.current_step < len(route):
             self.after(speed, lambda: self.animate_step(route, speed))
     
+    def shade_unreachable(self, star_ids):
+        # Dims the stars the burro cannot reach from the selected start
+        for star_id in star_ids:
+            if star_id in self.star_objects:
+                self.itemconfig(self.star_objects[star_id]['circle'], stipple="gray25")
+    
     def reset_highlight(self):
         for star_data in self.star_objects.values():
-            self.itemconfig(star_data['circle'], outline="black", width=2)
+            self.itemconfig(star_data['circle'], outline="black", width=2, stipple="")
         
         for connection_data in self.connection_objects.values():
             self.draw_connection(connection_data)
\ No newline at end of file
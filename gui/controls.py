@@ -20,6 +20,8 @@ except ImportError:
         HEALTH_DEAD = "Muerto"
 
 class ControlPanel(ttk.Frame):
+    DESTINATION_ALGORITHMS = ("to_destination", "a_star", "survivable")
+    
     def __init__(self, parent, main_app):
         super().__init__(parent)
         self.main_app = main_app
@@ -151,6 +153,14 @@ class ControlPanel(ttk.Frame):
         to_destination_radio = ttk.Radiobutton(algo_frame, text="A Destino Específico", 
                                               variable=self.algorithm_var, value="to_destination")
         to_destination_radio.grid(row=3, column=0, sticky=tk.W)
+        
+        a_star_radio = ttk.Radiobutton(algo_frame, text="A Destino (A*)", 
+                                      variable=self.algorithm_var, value="a_star")
+        a_star_radio.grid(row=4, column=0, sticky=tk.W)
+        
+        survivable_radio = ttk.Radiobutton(algo_frame, text="A Destino (Sobreviviendo)", 
+                                          variable=self.algorithm_var, value="survivable")
+        survivable_radio.grid(row=5, column=0, sticky=tk.W)
     
     def setup_obstacle_controls(self):
         obstacle_frame = ttk.LabelFrame(self.scrollable_frame, text="Control de Obstáculos", padding=10)
@@ -284,7 +294,7 @@ class ControlPanel(ttk.Frame):
     
     def clear_all_obstacles(self):
         if hasattr(self.main_app, 'graph'):
-            self.main_app.graph.blocked_edges.clear()
+            self.main_app.graph.clear_blocked_edges()
             if hasattr(self.main_app, 'canvas'):
                 self.main_app.canvas.draw_graph(self.main_app.graph)
     
@@ -322,11 +332,11 @@ class ControlPanel(ttk.Frame):
         
         algorithm_type = self.algorithm_var.get()
         
-        if algorithm_type == "to_destination" and not self.selected_end_star:
+        if algorithm_type in self.DESTINATION_ALGORITHMS and not self.selected_end_star:
             messagebox.showwarning("Advertencia", "Para 'A Destino Específico' selecciona también una estrella destino (clic derecho)")
             return
         
-        end_star = self.selected_end_star if algorithm_type == "to_destination" else None
+        end_star = self.selected_end_star if algorithm_type in self.DESTINATION_ALGORITHMS else None
         
         self.main_app.calculate_route(self.selected_start_star, algorithm_type, end_star)
     
@@ -349,7 +359,7 @@ class ControlPanel(ttk.Frame):
             self.current_route = self.main_app.calculate_route(
                 self.selected_start_star, 
                 algorithm_type, 
-                self.selected_end_star if algorithm_type == "to_destination" else None
+                self.selected_end_star if algorithm_type in self.DESTINATION_ALGORITHMS else None
             )
             
             if not self.current_route:
@@ -736,7 +746,7 @@ class ControlPanel(ttk.Frame):
         
         ttk.Button(report_window, text="Exportar Reporte", command=export_report).pack(pady=10)
     
-    def show_route_info(self, route, total_distance=0):
+    def show_route_info(self, route, total_distance=0, proven_optimal=True):
         self.route_text.config(state=tk.NORMAL)
         self.route_text.delete(1.0, tk.END)
         
@@ -756,8 +766,14 @@ class ControlPanel(ttk.Frame):
         
         if algorithm_type == "max_stars":
             self.route_text.insert(tk.END, "Objetivo: Visitar la mayor cantidad de estrellas antes de morir\n")
+            if not proven_optimal:
+                self.route_text.insert(tk.END, "Nota: se alcanzó el límite de tiempo; es la mejor ruta encontrada, sin garantía de ser óptima\n")
         elif algorithm_type == "to_destination":
             self.route_text.insert(tk.END, "Objetivo: Ruta más corta al destino específico\n")
+        elif algorithm_type == "a_star":
+            self.route_text.insert(tk.END, "Objetivo: Ruta más corta al destino específico (búsqueda A*)\n")
+        elif algorithm_type == "survivable":
+            self.route_text.insert(tk.END, "Objetivo: Ruta más corta al destino en la que el burro llega con vida\n")
         elif algorithm_type == "optimal_route":
             self.route_text.insert(tk.END, "Objetivo: Máxima eficiencia de recursos (estrellas/consumo)\n")
         
@@ -11,7 +11,9 @@ try:
     from models.graph import StarGraph
     from models.constellation import Constellation
     from models.star import Star
+    from models.star_store import StarStore
     from utils.file_loader import FileLoader
+    from utils.constants import Constants
 except ImportError as e:
     print(f"Error importando módulos: {e}")
     class StarGraph:
@@ -25,10 +27,17 @@ except ImportError as e:
     class Star: 
         def __init__(self, **kwargs): 
             pass
+    StarStore = None
     class FileLoader:
         @staticmethod
         def load_constellations(file_path):
             return {"constellations": []}
+    class Constants:
+        MAX_STARS_TIME_BUDGET = 2.0
+        SURVIVABLE_ROUTE_TIME_BUDGET = 5.0
+        SURVIVABLE_ROUTE_LABEL_BUDGET = 500000
+        DEFAULT_ROUTE_STRATEGY = "cached"
+        LANDMARK_COUNT = 8
 
 from gui.canvas import StarCanvas
 from gui.controls import ControlPanel
@@ -83,6 +92,9 @@ class MainWindow:
                 data = loader.load_constellations(file_path)
                 self.process_constellation_data(data)
                 self.current_file = file_path
+                self.graph.data_path = file_path
+                if Constants.DEFAULT_ROUTE_STRATEGY == "alt":
+                    self.graph.prepare_landmarks(Constants.LANDMARK_COUNT, file_path)
                 messagebox.showinfo("Éxito", "Constelaciones cargadas correctamente")
                 
             except Exception as e:
@@ -90,6 +102,8 @@ class MainWindow:
     
     def process_constellation_data(self, data):
         self.graph = StarGraph()
+        # One store per load, so the previous map's stars are freed with it
+        store = StarStore() if StarStore else None
         
         for constellation_data in data.get('constellations', []):
             constellation = Constellation(constellation_data['name'])
@@ -106,7 +120,8 @@ class MainWindow:
                     research_effect=star_data.get('researchEffect', 0),
                     hypergiant=star_data.get('hypergiant', False),
                     linked_to=star_data['linkedTo'],
-                    galaxy=galaxy  
+                    galaxy=galaxy,
+                    store=store
                 )
                 constellation.add_star(star)
             
@@ -147,21 +162,43 @@ class MainWindow:
             finder = PathFinder(self.graph)
             
             route = []
+            proven_optimal = True
             
             if algorithm_type == "max_stars":
-                route = finder.find_max_stars_route(
+                route, proven_optimal = finder.find_max_stars_route_anytime(
                     start_star_id,
                     burro_data['health_state'],
                     burro_data['start_age'],
                     burro_data['initial_energy'],
                     burro_data['grass'],
-                    burro_data['death_age']
+                    burro_data['death_age'],
+                    time_budget=Constants.MAX_STARS_TIME_BUDGET
                 )
             elif algorithm_type == "to_destination":
                 if not end_star_id:
                     messagebox.showwarning("Advertencia", "Selecciona una estrella destino primero (clic derecho)")
                     return []
                 route = finder.find_route_to_destination(start_star_id, end_star_id)
+            elif algorithm_type == "a_star":
+                if not end_star_id:
+                    messagebox.showwarning("Advertencia", "Selecciona una estrella destino primero (clic derecho)")
+                    return []
+                route = finder.find_route_a_star(start_star_id, end_star_id)
+            elif algorithm_type == "survivable":
+                if not end_star_id:
+                    messagebox.showwarning("Advertencia", "Selecciona una estrella destino primero (clic derecho)")
+                    return []
+                route, proven_optimal = finder.find_survivable_route(
+                    start_star_id,
+                    end_star_id,
+                    burro_data['health_state'],
+                    burro_data['start_age'],
+                    burro_data['initial_energy'],
+                    burro_data['grass'],
+                    burro_data['death_age'],
+                    label_budget=Constants.SURVIVABLE_ROUTE_LABEL_BUDGET,
+                    time_budget=Constants.SURVIVABLE_ROUTE_TIME_BUDGET
+                )
             elif algorithm_type == "optimal_route":
                 route = finder.find_optimal_route(
                     start_star_id,
@@ -174,11 +211,18 @@ class MainWindow:
             if route:
                 self.canvas.highlight_route(route)
                 
+                if algorithm_type in ("max_stars", "survivable"):
+                    self.canvas.shade_unreachable(finder.last_unreachable_stars())
+                
                 total_distance = self.calculate_route_distance(route)
                 
-                self.control_panel.show_route_info(route, total_distance)
+                self.control_panel.show_route_info(route, total_distance, proven_optimal)
                 
                 return route
+            elif not proven_optimal:
+                messagebox.showwarning("Advertencia", "No se encontró una ruta dentro del límite de búsqueda "
+                                                      "(sin garantía de que no exista)")
+                return []
             else:
                 messagebox.showwarning("Advertencia", "No se pudo calcular una ruta válida")
                 return []
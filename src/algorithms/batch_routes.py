@@ -0,0 +1,108 @@
+import heapq
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+from models.compiled_graph import worker_pool, worker_graph
+
+
+def _routes_from_worker(source, targets):
+    return routes_from(worker_graph(), source, targets)
+
+
+def routes_from(compiled, source, targets):
+    # One Dijkstra per source that stops once every requested target is
+    # settled. Returns (target, path of indices, distance) in targets order.
+    distances = {source: 0}
+    previous = {source: -1}
+    pending = set(targets)
+    pending.discard(source)
+
+    offsets = compiled.offsets
+    neighbors = compiled.neighbors
+    weights = compiled.weights
+    blocked = compiled.blocked
+    pq = [(0, source)]
+    while pq and pending:
+        current_distance, current = heapq.heappop(pq)
+        if current_distance > distances[current]:
+            continue
+        pending.discard(current)
+        for k in range(offsets[current], offsets[current + 1]):
+            if blocked[k]:
+                continue
+            neighbor = neighbors[k]
+            new_distance = current_distance + weights[k]
+            if new_distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                heapq.heappush(pq, (new_distance, neighbor))
+
+    results = []
+    for target in targets:
+        if target in pending or target not in distances:
+            results.append((target, [], float('inf')))
+            continue
+        path = [target]
+        while previous[path[-1]] != -1:
+            path.append(previous[path[-1]])
+        results.append((target, path[::-1], distances[target]))
+    return results
+
+
+class BatchRouter:
+    # Answers many (start, end) route queries. Pairs are read in chunks of
+    # chunk_size and grouped by start star inside each chunk, so every
+    # source pays for a single shortest-path tree and only one chunk is held
+    # in memory at a time. Results are yielded as
+    # (start_id, end_id, route, distance) grouped by source, not in
+    # submission order. With workers > 1 the groups of a chunk run on a
+    # process pool that receives the compiled graph once per worker.
+    def __init__(self, compiled, workers=1, chunk_size=4096):
+        self.compiled = compiled
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def routes(self, pairs):
+        pairs = iter(pairs)
+        if self.workers <= 1:
+            while True:
+                groups, missing = self._group(islice(pairs, self.chunk_size))
+                if not groups and not missing:
+                    return
+                yield from missing
+                for source, targets in groups.items():
+                    yield from self._format(source, routes_from(self.compiled, source, targets))
+            return
+
+        with worker_pool(self.compiled, self.workers) as executor:
+            while True:
+                groups, missing = self._group(islice(pairs, self.chunk_size))
+                if not groups and not missing:
+                    return
+                yield from missing
+                futures = {executor.submit(_routes_from_worker, source, targets): source
+                           for source, targets in groups.items()}
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        source = futures.pop(future)
+                        yield from self._format(source, future.result())
+
+    def _group(self, chunk):
+        groups = OrderedDict()
+        missing = []
+        for start_id, end_id in chunk:
+            start = self.compiled.star_index(start_id)
+            end = self.compiled.star_index(end_id)
+            if start is None or end is None:
+                missing.append((start_id, end_id, [], float('inf')))
+                continue
+            groups.setdefault(start, []).append(end)
+        return groups, missing
+
+    def _format(self, source, results):
+        ids = self.compiled.ids
+        start_id = ids[source]
+        for target, path, distance in results:
+            yield start_id, ids[target], [ids[i] for i in path], distance
@@ -0,0 +1,100 @@
+import heapq
+
+
+class KShortestPaths:
+    # Yen's k shortest loopless routes over a compiled graph, honouring its
+    # blocked links. Every spur search is an A* guided by the exact distances
+    # to the target in the unrestricted graph, computed once per query:
+    # removing root stars and links can only lengthen routes, so the bound
+    # stays admissible and the searches stay close to the answer.
+    #
+    # Following Lawler, a new route only spawns spurs from its deviation
+    # index on; earlier roots and their removed links are unchanged. The next
+    # hops already taken after each root prefix are cached in a dict so the
+    # removed links of a spur are a lookup instead of a scan over every route.
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.spur_searches = 0
+
+    def routes(self, source, target, k):
+        # Returns up to k (path of star indices, distance), shortest first
+        self.spur_searches = 0
+        if k <= 0:
+            return []
+        to_target = self.compiled.distances_to(target)
+        if to_target[source] == float('inf'):
+            return []
+
+        first = self._spur(source, target, (), (), to_target)
+        found = [(first[0], first[1], 0)]
+        next_hops = {}
+        self._remember(next_hops, first[0])
+        seen = {tuple(first[0])}
+        candidates = []
+        counter = 0
+
+        while len(found) < k:
+            nodes, costs, deviation = found[-1]
+            for i in range(deviation, len(nodes) - 1):
+                root = nodes[:i + 1]
+                result = self._spur(nodes[i], target, set(root[:-1]),
+                                    next_hops.get(tuple(root), ()), to_target)
+                if result is None:
+                    continue
+                spur_nodes, spur_costs = result
+                path = root + spur_nodes[1:]
+                key = tuple(path)
+                if key in seen:
+                    continue
+                seen.add(key)
+                path_costs = costs[:i + 1] + [costs[i] + cost for cost in spur_costs[1:]]
+                counter += 1
+                heapq.heappush(candidates, (path_costs[-1], len(path), counter, path, path_costs, i))
+
+            if not candidates:
+                break
+            _, _, _, path, path_costs, deviation = heapq.heappop(candidates)
+            found.append((path, path_costs, deviation))
+            self._remember(next_hops, path)
+
+        return [(nodes, costs[-1]) for nodes, costs, _ in found]
+
+    def _remember(self, next_hops, path):
+        for i in range(len(path) - 1):
+            next_hops.setdefault(tuple(path[:i + 1]), set()).add(path[i + 1])
+
+    def _spur(self, spur, target, banned, removed, to_target):
+        self.spur_searches += 1
+        offsets = self.compiled.offsets
+        neighbors = self.compiled.neighbors
+        weights = self.compiled.weights
+        blocked = self.compiled.blocked
+
+        distances = {spur: 0}
+        previous = {spur: -1}
+        pq = [(to_target[spur], 0, spur)]
+        while pq:
+            _, current_distance, current = heapq.heappop(pq)
+            if current_distance > distances[current]:
+                continue
+            if current == target:
+                nodes = [current]
+                while previous[nodes[-1]] != -1:
+                    nodes.append(previous[nodes[-1]])
+                nodes.reverse()
+                return nodes, [distances[node] for node in nodes]
+
+            for k in range(offsets[current], offsets[current + 1]):
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                if neighbor in banned or (current == spur and neighbor in removed):
+                    continue
+                if to_target[neighbor] == float('inf'):
+                    continue
+                new_distance = current_distance + weights[k]
+                if new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (new_distance + to_target[neighbor], new_distance, neighbor))
+        return None
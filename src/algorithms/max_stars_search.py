@@ -0,0 +1,187 @@
+import heapq
+import time
+from models.burro_state import travel, visit
+
+
+class MaxStarsSearch:
+    # Depth-first search over compact states (star, visited bitset, energy,
+    # grass, remaining life). Neighbors are expanded in adjacency order, so
+    # the first longest route found is the same one the old FIFO search
+    # returned. A state is pruned when an earlier state with the same star
+    # and visited set had at least as much energy, grass and life: every
+    # continuation of the pruned state is also open to the earlier one.
+    #
+    # Branches are also cut when an optimistic bound (unvisited stars whose
+    # distance fits in the remaining life plus every positive research effect
+    # still available) cannot beat the best route. With a time or node budget
+    # the search is anytime: it returns the best route found so far and
+    # proven_optimal tells whether the whole tree was exhausted.
+    #
+    # search_prefix explores only the subtree below a fixed route prefix.
+    # An optional shared_best (a multiprocessing.Value) lets several such
+    # searches prune against each other; it only cuts subtrees that cannot
+    # even tie it, so every subtree still finds its own first longest route.
+    TIME_CHECK_INTERVAL = 256
+
+    def __init__(self, compiled, reach=None):
+        self.compiled = compiled
+        # Optional ReachabilityMap of the start star: stars it rules out are
+        # skipped outright and its bound can end the search early
+        self.reach = reach
+        self.positive_effect = [max(0, effect) for effect in compiled.research_effect]
+        self.states_expanded = 0
+        self.states_pruned = 0
+        self.proven_optimal = False
+
+    def search(self, start, state, alive=True, time_budget=None, node_budget=None):
+        if not alive or state.is_dead():
+            self.proven_optimal = True
+            return [start]
+        return self.search_prefix([start], state, time_budget, node_budget)
+
+    def search_prefix(self, prefix, state, time_budget=None, node_budget=None, shared_best=None):
+        compiled = self.compiled
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
+
+        self.proven_optimal = True
+        best = list(prefix)
+        node = prefix[-1]
+        mask = 0
+        for star in prefix:
+            mask |= 1 << star
+
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        reachable = self.compiled.component_size(prefix[0])
+        reach = self.reach.reachable if self.reach is not None else None
+        if reach is not None:
+            reachable = min(reachable, self.reach.max_stars_bound())
+        frontier = {}
+        path = list(prefix)
+        positive_left = sum(self.positive_effect) - sum(self.positive_effect[star] for star in prefix)
+        stack = [[node, mask, state, offsets[node], positive_left]]
+        self._publish(shared_best, len(best))
+
+        while stack:
+            if node_budget is not None and self.states_expanded >= node_budget:
+                self.proven_optimal = False
+                break
+            if (deadline is not None and self.states_expanded % self.TIME_CHECK_INTERVAL == 0
+                    and time.monotonic() >= deadline):
+                self.proven_optimal = False
+                break
+
+            frame = stack[-1]
+            node, mask, state, slot, positive_left = frame
+            end = offsets[node + 1]
+            child = None
+
+            while slot < end:
+                k = slot
+                slot += 1
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                if mask >> neighbor & 1 or (reach is not None and not reach[neighbor]):
+                    continue
+                child_state = self.expand(state, weights[k], neighbor)
+                if child_state is None:
+                    continue
+                child_mask = mask | (1 << neighbor)
+                if not self._record(frontier, neighbor, child_mask, child_state):
+                    self.states_pruned += 1
+                    continue
+                child_positive = positive_left - self.positive_effect[neighbor]
+                needed = len(best) - len(path) - 1
+                if shared_best is not None:
+                    needed = max(needed, shared_best.value - len(path) - 2)
+                if not self._can_reach(neighbor, child_mask, child_state, child_positive, needed):
+                    self.states_pruned += 1
+                    continue
+                child = [neighbor, child_mask, child_state, offsets[neighbor], child_positive]
+                break
+
+            frame[3] = slot
+            if child is None:
+                stack.pop()
+                path.pop()
+                continue
+
+            self.states_expanded += 1
+            stack.append(child)
+            path.append(child[0])
+            if len(path) > len(best):
+                best = list(path)
+                self._publish(shared_best, len(best))
+                if len(best) == reachable:
+                    self.proven_optimal = True
+                    break
+
+        return best
+
+    def expand(self, state, distance, neighbor):
+        state = travel(state, distance)
+        if state.is_dead():
+            return None
+        star = self.compiled.stars[neighbor]
+        state = visit(state, star, star.time_to_eat * 0.5)
+        if state.is_dead():
+            return None
+        return state
+
+    def _record(self, frontier, star, mask, state):
+        key = (star, mask)
+        labels = frontier.get(key)
+        if labels is None:
+            frontier[key] = [state]
+            return True
+
+        for label in labels:
+            if label.dominates(state):
+                return False
+
+        labels[:] = [label for label in labels if not state.dominates(label)]
+        labels.append(state)
+        return True
+
+    def _can_reach(self, node, mask, state, positive_left, needed):
+        # True when more than `needed` unvisited stars could still be reached
+        if needed < 0:
+            return True
+        compiled = self.compiled
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
+        limit = state.remaining_life + positive_left
+        reach = self.reach.reachable if self.reach is not None else None
+
+        distances = {node: 0}
+        heap = [(0, node)]
+        count = 0
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if distance > distances[current]:
+                continue
+            if current != node:
+                count += 1
+                if count > needed:
+                    return True
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = neighbors[k]
+                if blocked[k] or mask >> neighbor & 1 or (reach is not None and not reach[neighbor]):
+                    continue
+                new_distance = distance + weights[k]
+                if new_distance < limit and new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbor))
+        return False
+
+    def _publish(self, shared_best, length):
+        if shared_best is None:
+            return
+        with shared_best.get_lock():
+            if length > shared_best.value:
+                shared_best.value = length
@@ -0,0 +1,151 @@
+import time
+import numpy as np
+from utils.constants import Constants
+from models import burro_batch
+
+
+class OrienteeringSolver:
+    # Exact max-stars solver for small components, in Held-Karp form: the
+    # table is indexed by (visited mask, current star) and filled one route
+    # length at a time, so the last non-empty layer holds the longest routes.
+    # Each entry keeps the Pareto set of burro states (energy, grass, life)
+    # that reach it; every layer lives in flat NumPy arrays and is expanded
+    # with the vectorized burro transitions in one batch.
+    #
+    # Entries are also dropped when they cannot reach lower_bound stars: at
+    # most the unvisited stars whose shortest-path-closure distance fits in
+    # the remaining life plus every positive research effect can still be
+    # added. Moves follow direct links only, as every star on a journey is
+    # visited, so closure distances are used for that bound alone.
+    #
+    # A time_budget or label_budget is checked between layers; when it runs
+    # out solve returns None and completed stays False.
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.labels_created = 0
+        self.completed = False
+
+    def component(self, start):
+        seen = {start}
+        order = [start]
+        for star in order:
+            for neighbor, _ in self.compiled.adjacent(star):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    order.append(neighbor)
+        return order
+
+    def solve(self, start, state, alive=True, lower_bound=1, members=None,
+              time_budget=None, label_budget=None):
+        # Returns the longest survivable route from start as star indices
+        self.labels_created = 0
+        self.completed = True
+        if not alive or state.is_dead():
+            return [start]
+        members = members or self.component(start)
+        if len(members) > Constants.EXACT_SOLVER_MAX_STARS:
+            raise ValueError(f"Componente demasiado grande para el solver exacto: {len(members)} estrellas")
+
+        compiled = self.compiled
+        count = len(members)
+        local = {star: i for i, star in enumerate(members)}
+        stars = [compiled.stars[star] for star in members]
+        time_to_eat = np.array([star.time_to_eat for star in stars], dtype=float)
+        research_effect = np.array([star.research_effect for star in stars], dtype=float)
+
+        links = [[(local[neighbor], distance) for neighbor, distance in compiled.adjacent(star)
+                  if neighbor in local] for star in members]
+        width = max(1, max(len(row) for row in links))
+        link_to = np.full((count, width), -1, dtype=np.int64)
+        link_distance = np.zeros((count, width))
+        closure = np.full((count, count), np.inf)
+        np.fill_diagonal(closure, 0)
+        for i, row in enumerate(links):
+            for k, (j, distance) in enumerate(row):
+                link_to[i, k] = j
+                link_distance[i, k] = distance
+                closure[i, j] = min(closure[i, j], distance)
+        for k in range(count):
+            closure = np.minimum(closure, closure[:, k, None] + closure[None, k, :])
+        bits = np.int64(1) << np.arange(count, dtype=np.int64)
+        positive_effect = np.maximum(0, research_effect)
+
+        masks = np.array([bits[0]])
+        current = np.array([0])
+        energy = np.array([float(state.energy)])
+        grass = np.array([float(state.grass)])
+        life = np.array([float(state.remaining_life)])
+        layers = [(current, np.array([-1]))]
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+        while True:
+            if ((deadline is not None and time.monotonic() >= deadline) or
+                    (label_budget is not None and self.labels_created >= label_budget)):
+                self.completed = False
+                return None
+            label = np.repeat(np.arange(len(masks)), width)
+            target = link_to[current].ravel()
+            distance = link_distance[current].ravel()
+            keep = (target >= 0)
+            label, target, distance = label[keep], target[keep], distance[keep]
+            keep = (masks[label] & bits[target]) == 0
+            label, target, distance = label[keep], target[keep], distance[keep]
+
+            e, g, l = burro_batch.travel(energy[label], grass[label], life[label], distance)
+            e, g, l = burro_batch.visit(e, g, l, time_to_eat[target], time_to_eat[target] * 0.5,
+                                        research_effect[target])
+            keep = ~burro_batch.is_dead(e, l)
+            label, target = label[keep], target[keep]
+            e, g, l = e[keep], g[keep], l[keep]
+            child_masks = masks[label] | bits[target]
+
+            # Budget pruning against the stars each label can still reach
+            unvisited = (child_masks[:, None] & bits[None, :]) == 0
+            effect_left = (unvisited * positive_effect[None, :]).sum(axis=1)
+            reachable = unvisited & (closure[target] <= (l + effect_left)[:, None])
+            keep = len(layers) + 1 + reachable.sum(axis=1) >= lower_bound
+            label, target, child_masks = label[keep], target[keep], child_masks[keep]
+            e, g, l = e[keep], g[keep], l[keep]
+            if len(label) == 0:
+                break
+
+            keep = self._pareto(child_masks * count + target, e, g, l)
+            masks, current = child_masks[keep], target[keep]
+            energy, grass, life = e[keep], g[keep], l[keep]
+            layers.append((current, label[keep]))
+            self.labels_created += len(keep)
+
+        route = []
+        index = 0
+        for current, parent in reversed(layers):
+            route.append(members[int(current[index])])
+            index = int(parent[index])
+        return route[::-1]
+
+    def _pareto(self, keys, energy, grass, life):
+        # Indices of the labels not dominated by another label with the same key
+        order = np.lexsort((-life, -grass, -energy, keys))
+        sorted_keys = keys[order]
+        first = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        group = np.cumsum(first) - 1
+        head = order[np.flatnonzero(first)][group]
+
+        # The head of each group has the most energy, so drop whatever it
+        # dominates in one pass; only the rest needs pairwise checks
+        survivor = first | (grass[order] > grass[head]) | (life[order] > life[head])
+        order, group = order[survivor], group[survivor]
+        shared = np.r_[group[1:] == group[:-1], False] | np.r_[False, group[1:] == group[:-1]]
+        kept = []
+        frontier = []
+        previous = -1
+        grass_of = grass.tolist()
+        life_of = life.tolist()
+        for i, g in zip(order[shared].tolist(), group[shared].tolist()):
+            if g != previous:
+                frontier = []
+                previous = g
+            # Sorted by energy first, so only earlier labels can dominate
+            if not any(grass_of[j] >= grass_of[i] and life_of[j] >= life_of[i] for j in frontier):
+                frontier.append(i)
+                kept.append(i)
+        return np.sort(np.concatenate([order[~shared], np.array(kept, dtype=order.dtype)]))
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import time
+from models.compiled_graph import worker_pool, worker_graph
+from algorithms.max_stars_search import MaxStarsSearch
+
+_worker_best = None
+
+
+def _init_worker(shared_best):
+    global _worker_best
+    _worker_best = shared_best
+
+
+def _search_subtree(prefix, state, deadline):
+    time_budget = max(0, deadline - time.time()) if deadline is not None else None
+    search = MaxStarsSearch(worker_graph())
+    route = search.search_prefix(prefix, state, time_budget=time_budget, shared_best=_worker_best)
+    return route, search.proven_optimal
+
+
+class ParallelMaxStarsSearch:
+    # Splits the max-stars search by its first- and second-hop subtrees and
+    # runs them on a process pool. Subtrees are listed in adjacency order and
+    # the merge keeps the first longest route, so the answer is the same one
+    # the sequential MaxStarsSearch returns, regardless of worker timing.
+    def __init__(self, compiled, workers=None):
+        self.compiled = compiled
+        self.expander = MaxStarsSearch(compiled)
+        self.workers = workers or os.cpu_count() or 1
+        self.proven_optimal = False
+
+    def search(self, start, state, alive=True, time_budget=None):
+        self.proven_optimal = True
+        if not alive or state.is_dead():
+            return [start]
+
+        deadline = time.time() + time_budget if time_budget is not None else None
+        tasks = self._split(start, state)
+        if not tasks:
+            return [start]
+
+        shared_best = multiprocessing.Value('i', 1)
+        with worker_pool(self.compiled, min(self.workers, len(tasks)),
+                         _init_worker, (shared_best,)) as executor:
+            futures = [executor.submit(_search_subtree, prefix, child_state, deadline)
+                       for prefix, child_state in tasks]
+            results = [future.result() for future in futures]
+
+        best = [start]
+        for route, proven_optimal in results:
+            if len(route) > len(best):
+                best = route
+            self.proven_optimal = self.proven_optimal and proven_optimal
+        return best
+
+    def _split(self, start, state):
+        tasks = []
+        for first, first_state in self._children([start], state):
+            second_hops = self._children([start, first], first_state)
+            if not second_hops:
+                tasks.append(([start, first], first_state))
+            for second, second_state in second_hops:
+                tasks.append(([start, first, second], second_state))
+        return tasks
+
+    def _children(self, prefix, state):
+        children = []
+        for neighbor, distance in self.compiled.adjacent(prefix[-1]):
+            if neighbor in prefix:
+                continue
+            child_state = self.expander.expand(state, distance, neighbor)
+            if child_state is not None:
+                children.append((neighbor, child_state))
+        return children
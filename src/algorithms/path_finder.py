@@ -1,246 +1,519 @@
 import heapq
-import copy
+import math
+import time
+import numpy as np
 from utils.constants import Constants
+from exceptions.graph_exceptions import StarNotFoundError, InvalidRouteError
 from models.burro import Burro
+from models.burro_state import BurroState
+from models.burro_population import BurroPopulation
+from models.compiled_graph import StarRecord
+from algorithms.max_stars_search import MaxStarsSearch
+from algorithms.parallel_search import ParallelMaxStarsSearch
+from algorithms.batch_routes import BatchRouter
+from algorithms.k_shortest import KShortestPaths
+from algorithms.survivable_route import SurvivableRouteSearch
+from algorithms.route_scoring import RouteScorer
+from algorithms.orienteering import OrienteeringSolver
+from algorithms.route_improver import RouteImprover
+from algorithms.robustness import RouteRobustnessAnalysis
+from algorithms.reachability import ReachabilityMap
 
 class PathFinder:
     def __init__(self, graph):
         self.graph = graph
+        self.nodes_expanded = 0
+        # Reachability map of the last planner call, kept so callers such as
+        # the canvas can reuse it instead of building another one
+        self.last_reachability = None
+        self._reachability_key = None
     
     def find_max_stars_route(self, start_star_id, initial_health, initial_age, 
                            initial_energy, initial_grass, death_age):
-       
+        route, _ = self.find_max_stars_route_anytime(
+            start_star_id, initial_health, initial_age,
+            initial_energy, initial_grass, death_age
+        )
+        return route
+    
+    def find_max_stars_route_anytime(self, start_star_id, initial_health, initial_age,
+                                     initial_energy, initial_grass, death_age,
+                                     time_budget=None, node_budget=None):
         start_star_id = str(start_star_id)
-        start_star = self.graph.get_star_by_id(start_star_id)
-        if not start_star:
-            return [start_star_id]
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        if start is None:
+            return [start_star_id], True
         
         burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
+        state = BurroState.from_burro(burro)
+        
+        # The map is charged to the budgets; if it does not fit in its share
+        # the search runs without it
+        started = time.monotonic()
+        share = Constants.REACHABILITY_BUDGET_SHARE
+        reach = self._reachability(
+            compiled, start, state, not burro.is_dead(),
+            deadline=started + time_budget * share if time_budget is not None else None,
+            update_budget=int(node_budget * share) if node_budget is not None else None
+        )
+        if time_budget is not None:
+            time_budget = max(0.0, time_budget - (time.monotonic() - started))
+        if node_budget is not None and reach is not None:
+            node_budget = max(0, node_budget - reach.updates)
+        
+        solver = OrienteeringSolver(compiled)
+        members = None
+        if compiled.component_size(start) <= Constants.EXACT_SOLVER_MAX_STARS:
+            members = [star for star in solver.component(start)
+                       if reach is None or reach.reachable[star]]
+        elif reach is not None and reach.max_stars_bound() <= Constants.EXACT_SOLVER_MAX_STARS:
+            members = [star for star in range(len(compiled)) if reach.reachable[star]]
+        if members is not None:
+            # A short search settles easy cases and bounds the exact solver.
+            # Both share the budgets; if the solver runs out, the warm-up
+            # route comes back unproven.
+            started = time.monotonic()
+            warmup_nodes = Constants.EXACT_SOLVER_WARMUP_NODES
+            if node_budget is not None:
+                warmup_nodes = min(warmup_nodes, node_budget)
+            search = MaxStarsSearch(compiled, reach)
+            best_route = search.search(start, state, alive=not burro.is_dead(),
+                                       time_budget=time_budget, node_budget=warmup_nodes)
+            if search.proven_optimal or len(best_route) == len(members):
+                return compiled.path_to_ids(best_route), True
+            
+            time_left = time_budget - (time.monotonic() - started) if time_budget is not None else None
+            labels_left = node_budget - search.states_expanded if node_budget is not None else None
+            if (time_left is not None and time_left <= 0) or (labels_left is not None and labels_left <= 0):
+                return compiled.path_to_ids(best_route), False
+            exact_route = solver.solve(start, state, alive=not burro.is_dead(),
+                                       lower_bound=len(best_route), members=members,
+                                       time_budget=time_left, label_budget=labels_left)
+            if exact_route is None:
+                return compiled.path_to_ids(best_route), False
+            return compiled.path_to_ids(exact_route), True
+        
+        search = MaxStarsSearch(compiled, reach)
+        best_route = search.search(
+            start,
+            state,
+            alive=not burro.is_dead(),
+            time_budget=time_budget,
+            node_budget=node_budget
+        )
+        
+        return compiled.path_to_ids(best_route), search.proven_optimal
+    
+    def find_max_stars_route_parallel(self, start_star_id, initial_health, initial_age,
+                                      initial_energy, initial_grass, death_age,
+                                      workers=None, time_budget=None):
+        start_star_id = str(start_star_id)
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        if start is None:
+            return [start_star_id], True
         
-        best_route = [start_star_id]
-        best_count = 1
+        burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
         
-        queue = [(start_star_id, [start_star_id], copy.deepcopy(burro))]
+        search = ParallelMaxStarsSearch(compiled, workers)
+        best_route = search.search(
+            start,
+            BurroState.from_burro(burro),
+            alive=not burro.is_dead(),
+            time_budget=time_budget
+        )
         
-        while queue:
-            current_star_id, current_route, current_burro = queue.pop(0)
-            
-            if len(current_route) > best_count:
-                best_route = current_route
-                best_count = len(current_route)
-            
-            adjacent_stars = self.graph.get_adjacent_stars(current_star_id)
-            for neighbor_id, distance in adjacent_stars:
-                if neighbor_id not in current_route:  
-                    new_burro = copy.deepcopy(current_burro)
-                    
-                    if new_burro.travel(distance) and not new_burro.is_dead():
-                        neighbor_star = self.graph.get_star_by_id(neighbor_id)
-                        if neighbor_star:
-                            research_time = neighbor_star.time_to_eat * 0.5
-                            new_burro.visit_star(neighbor_star, research_time)
-                            
-                            if not new_burro.is_dead():
-                                new_route = current_route + [neighbor_id]
-                                queue.append((neighbor_id, new_route, new_burro))
-        
-        return best_route
-    
-    def find_optimal_route(self, start_star_id, initial_health, initial_energy, initial_grass, health_state):
+        return compiled.path_to_ids(best_route), search.proven_optimal
+    
+    def simulate_population(self, route, initial_energy, grass, start_age, death_age,
+                            research_overrides=None):
+        # Replays route for every combination at once; arguments broadcast
+        stars, distances = self._route_stars(route)
+        if not stars:
+            return None
+        
+        population = BurroPopulation(initial_energy, grass, start_age, death_age)
+        return population.run_route(stars, distances, research_overrides)
+    
+    def analyze_route_robustness(self, route, initial_energy, grass, start_age, death_age,
+                                 distributions, samples=100000, seed=0, workers=1,
+                                 research_overrides=None, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        # distributions maps star ids to ("normal", mean, std) and the like;
+        # research_overrides holds fixed effects, as ControlPanel.research_changes
+        stars, distances = self._route_stars(route)
+        if not stars:
+            return None
+        
+        research_overrides = research_overrides or {}
+        stars = [StarRecord(star.id, star.time_to_eat, research_overrides.get(star.id, star.research_effect))
+                 for star in stars]
+        analysis = RouteRobustnessAnalysis(stars, distances, workers)
+        return analysis.run((initial_energy, grass, start_age, death_age), distributions,
+                            samples, quantiles, seed)
+    
+    def _route_stars(self, route):
+        stars = []
+        distances = []
+        for k, star_id in enumerate(route):
+            star = self.graph.get_star_by_id(star_id)
+            if star is None:
+                raise StarNotFoundError(f"Estrella no encontrada: {star_id}")
+            if stars:
+                distance = next((connection['distance'] for connection in stars[-1].linked_to
+                                 if str(connection['starId']) == str(star_id)), None)
+                if distance is None:
+                    raise InvalidRouteError(f"No hay conexión entre {route[k - 1]} y {star_id}")
+                if self.graph.is_edge_blocked(route[k - 1], star_id):
+                    raise InvalidRouteError(f"La conexión entre {route[k - 1]} y {star_id} está bloqueada")
+                distances.append(distance)
+            stars.append(star)
+        return stars, distances
+    
+    def improve_route(self, route, initial_health, initial_age, initial_energy, initial_grass, death_age,
+                      time_budget=None, epochs=None, seed=0, islands=None, workers=1):
+        # Improves a route from find_optimal_route or find_max_stars_route
+        compiled = self.graph.get_compiled()
+        indices = []
+        for star_id in route:
+            index = compiled.star_index(star_id)
+            if index is None:
+                break
+            indices.append(index)
+        if not indices:
+            return list(route)
+        
+        if time_budget is None and epochs is None:
+            time_budget = Constants.IMPROVER_TIME_BUDGET
+        burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
+        if burro.is_dead():
+            return compiled.path_to_ids(indices[:1])
+        
+        improver = RouteImprover(compiled, islands or Constants.IMPROVER_ISLANDS, workers, seed,
+                                 Constants.IMPROVER_ITERATIONS)
+        best = improver.improve(indices, BurroState.from_burro(burro), time_budget, epochs)
+        return compiled.path_to_ids(best)
+    
+    def find_optimal_route(self, start_star_id, initial_health, initial_energy, initial_grass, health_state,
+                           lookahead=None, beam_width=None):
         
         start_star_id = str(start_star_id)
-        start_star = self.graph.get_star_by_id(start_star_id)
-        if not start_star:
+        compiled = self.graph.get_compiled()
+        current = compiled.star_index(start_star_id)
+        if current is None:
             return [start_star_id]
         
-        from models.burro import Burro
+        lookahead = lookahead or Constants.OPTIMAL_ROUTE_LOOKAHEAD
+        beam_width = beam_width or Constants.OPTIMAL_ROUTE_BEAM_WIDTH
+        
         simulated_burro = Burro(health_state, initial_energy, initial_grass, 0, float('inf'))
+        state = BurroState.from_burro(simulated_burro)
+        scorer = RouteScorer(compiled)
         
-        visited = set([start_star_id])
-        route = [start_star_id]
-        current_star_id = start_star_id
+        visited = np.zeros(len(compiled), dtype=bool)
+        visited[current] = True
+        route = [current]
         
-        while (not simulated_burro.is_dead() and 
-               len(visited) < len(self.graph.all_stars)):
-            
-            best_next_star = None
-            best_efficiency = -float('inf')
-            min_distance = float('inf')
-            
-            adjacent_stars = self.graph.get_adjacent_stars(current_star_id)
+        while not state.is_dead() and len(route) < len(compiled):
+            choice = scorer.choose(current, state, visited, lookahead, beam_width)
+            if choice is None:
+                break
             
-            for neighbor_id, distance in adjacent_stars:
-                if neighbor_id not in visited:
-                    efficiency = self._calculate_star_efficiency(
-                        distance, simulated_burro, neighbor_id
-                    )
-                    
-                    if efficiency > best_efficiency or (efficiency == best_efficiency and distance < min_distance):
-                        best_efficiency = efficiency
-                        best_next_star = neighbor_id
-                        min_distance = distance
+            next_star, distance = choice
+            state = scorer.step(state, distance, next_star)
+            if state is None:
+                break
             
-            if best_next_star:
-                if simulated_burro.travel(min_distance):
-                    next_star = self.graph.get_star_by_id(best_next_star)
-                    if next_star:
-                        research_time = next_star.time_to_eat * 0.5
-                        simulated_burro.visit_star(next_star, research_time)
-                        
-                        if not simulated_burro.is_dead():
-                            route.append(best_next_star)
-                            visited.add(best_next_star)
-                            current_star_id = best_next_star
-                        else:
-                            break
-                    else:
-                        break
-                else:
-                    break 
-            else:
-                break  
+            route.append(next_star)
+            visited[next_star] = True
+            current = next_star
         
-        return route
+        return compiled.path_to_ids(route)
     
-    def _calculate_star_efficiency(self, distance, burro, star_id):
-        star = self.graph.get_star_by_id(star_id)
-        if not star:
-            return -float('inf')
-        
-        distance_factor = 100.0 / (distance + 1)
-        
-        energy_factor = 1.0
-        if burro.current_energy < 30:
-            energy_factor = max(1.0, star.research_effect * 2)
-        
-        research_factor = 1.0 + (star.research_effect * 0.1)
-        
-        time_factor = 5.0 / (star.time_to_eat + 1)
-        
-        hypergiant_factor = 1.5 if star.hypergiant else 1.0
-        
-        efficiency = (distance_factor * 0.4 + 
-                     energy_factor * 0.2 + 
-                     research_factor * 0.2 + 
-                     time_factor * 0.1 + 
-                     hypergiant_factor * 0.1)
+    def find_route_to_destination(self, start_star_id, end_star_id, strategy=None):
+        strategy = strategy or Constants.DEFAULT_ROUTE_STRATEGY
+        if strategy == "cached":
+            return self.graph.shortest_paths.route(start_star_id, end_star_id)
+        elif strategy == "bidirectional":
+            return self.find_route_bidirectional(start_star_id, end_star_id)
+        elif strategy == "a_star":
+            return self.find_route_a_star(start_star_id, end_star_id)
+        elif strategy == "alt":
+            return self.find_route_alt(start_star_id, end_star_id)
+        elif strategy == "ch":
+            return self.find_route_ch(start_star_id, end_star_id)
+        raise ValueError(f"Estrategia de ruta desconocida: {strategy}")
+    
+    def _reachability(self, compiled, start, state, alive, deadline=None, update_budget=None):
+        key = (compiled, self.graph.version, start, tuple(state), alive)
+        if key != self._reachability_key or self.last_reachability is None:
+            self.last_reachability = ReachabilityMap.build(compiled, start, state, alive=alive,
+                                                           deadline=deadline, update_budget=update_budget)
+            self._reachability_key = key
+        return self.last_reachability
+    
+    def compute_reachability(self, start_star_id, initial_health, initial_age,
+                             initial_energy, initial_grass, death_age):
+        # ReachabilityMap of the burro from start, or None for an unknown star
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        if start is None:
+            return None
+        burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
+        return self._reachability(compiled, start, BurroState.from_burro(burro), not burro.is_dead())
+    
+    def find_unreachable_stars(self, start_star_id, initial_health, initial_age,
+                               initial_energy, initial_grass, death_age):
+        reach = self.compute_reachability(start_star_id, initial_health, initial_age,
+                                          initial_energy, initial_grass, death_age)
+        if reach is None:
+            return []
+        return self.graph.get_compiled().path_to_ids(reach.unreachable())
+    
+    def last_unreachable_stars(self):
+        # Stars the last planner call proved unreachable; [] if it had no map
+        if self.last_reachability is None:
+            return []
+        return self.graph.get_compiled().path_to_ids(self.last_reachability.unreachable())
+    
+    def find_survivable_route(self, start_star_id, end_star_id, initial_health, initial_age,
+                              initial_energy, initial_grass, death_age, label_budget=None,
+                              time_budget=None):
+        # (route, proven): the shortest route the burro completes alive, or
+        # [] with proven True when none exists. proven is False when a budget
+        # ran out first, so [] then only means none was found.
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        if start is None or end is None or not compiled.connected(start, end):
+            return [], True
         
-        if burro.current_energy < 20 and distance > 100:
-            efficiency *= 0.5
+        burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
+        state = BurroState.from_burro(burro)
+        # The map is charged to the time budget, as in find_max_stars_route_anytime
+        started = time.monotonic()
+        deadline = None
+        if time_budget is not None:
+            deadline = started + time_budget * Constants.REACHABILITY_BUDGET_SHARE
+        reach = self._reachability(compiled, start, state, not burro.is_dead(), deadline=deadline)
+        if time_budget is not None:
+            time_budget = max(0.0, time_budget - (time.monotonic() - started))
+        
+        search = SurvivableRouteSearch(compiled)
+        result = search.search(start, end, state, alive=not burro.is_dead(),
+                               label_budget=label_budget, reach=reach, time_budget=time_budget)
+        self.nodes_expanded = search.labels_created
+        if result is None:
+            return [], search.proven
+        return compiled.path_to_ids(result[0]), True
+    
+    def find_k_shortest_routes(self, start_star_id, end_star_id, k=3):
+        # Alternatives to find_route_to_destination: [(route, distance), ...]
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        if start is None or end is None or not compiled.connected(start, end):
+            return []
         
-        return efficiency
+        search = KShortestPaths(compiled)
+        routes = search.routes(start, end, k)
+        self.nodes_expanded = search.spur_searches
+        return [(compiled.path_to_ids(path), distance) for path, distance in routes]
     
-    def find_route_to_destination(self, start_star_id, end_star_id):
-        start_star_id = str(start_star_id)
-        end_star_id = str(end_star_id)
+    def find_routes_batch(self, pairs, workers=1, chunk_size=4096):
+        # Generator of (start_id, end_id, route, distance), grouped by start
+        router = BatchRouter(self.graph.get_compiled(), workers, chunk_size)
+        return router.routes(pairs)
+    
+    def find_route_ch(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        if start is None or end is None or not compiled.connected(start, end):
+            return []
         
-        start_star = self.graph.get_star_by_id(start_star_id)
-        end_star = self.graph.get_star_by_id(end_star_id)
+        if self.graph.contraction_hierarchy is None:
+            # Built on first use, or read back from the map's .ch.json
+            self.graph.prepare_contraction_hierarchy()
         
-        if not start_star or not end_star:
+        distance, path = self.graph.contraction_hierarchy.query(start, end)
+        if not path:
             return []
         
-        if start_star_id == end_star_id:
-            return [start_star_id]
-        
-        distances = {star_id: float('inf') for star_id in self.graph.all_stars}
-        previous = {star_id: None for star_id in self.graph.all_stars}
-        distances[start_star_id] = 0
+        # The hierarchy ignores obstacles. A route that avoids every blocked
+        # link is still the shortest one; otherwise fall back to a plain search.
+        for tail, head in zip(path, path[1:]):
+            if compiled.edge_weight(tail, head) is None:
+                return self.find_route_bidirectional(start_star_id, end_star_id)
+        return compiled.path_to_ids(path)
+    
+    def find_route_bidirectional(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        self.nodes_expanded = 0
         
-        import heapq
-        pq = [(0, start_star_id)]
+        if start is None or end is None or not compiled.connected(start, end):
+            return []
         
-        while pq:
-            current_distance, current_star_id = heapq.heappop(pq)
-            
-            if current_star_id == end_star_id:
+        if start == end:
+            return [compiled.ids[start]]
+        
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        rev_offsets = compiled.rev_offsets
+        rev_slots = compiled.rev_slots
+        rev_sources = compiled.rev_sources
+        weights = compiled.weights
+        blocked = compiled.blocked
+        
+        forward = {start: 0}
+        backward = {end: 0}
+        forward_parent = {start: -1}
+        backward_parent = {end: -1}
+        forward_done = set()
+        backward_done = set()
+        forward_pq = [(0, start)]
+        backward_pq = [(0, end)]
+        best = float('inf')
+        meeting = -1
+        
+        while forward_pq and backward_pq:
+            # Standard stopping rule: no unexplored pair can beat the best meet
+            if forward_pq[0][0] + backward_pq[0][0] >= best:
                 break
             
-            if current_distance > distances[current_star_id]:
-                continue
-            
-            adjacent_stars = self.graph.get_adjacent_stars(current_star_id)
-            for neighbor_id, distance in adjacent_stars:
-                if self.graph.is_edge_blocked(current_star_id, neighbor_id):
+            if forward_pq[0][0] <= backward_pq[0][0]:
+                current_distance, current = heapq.heappop(forward_pq)
+                if current in forward_done:
                     continue
-                    
-                new_distance = current_distance + distance
-                
-                if new_distance < distances[neighbor_id]:
-                    distances[neighbor_id] = new_distance
-                    previous[neighbor_id] = current_star_id
-                    heapq.heappush(pq, (new_distance, neighbor_id))
+                forward_done.add(current)
+                self.nodes_expanded += 1
+                for k in range(offsets[current], offsets[current + 1]):
+                    if blocked[k]:
+                        continue
+                    neighbor = neighbors[k]
+                    new_distance = current_distance + weights[k]
+                    if new_distance < forward.get(neighbor, float('inf')):
+                        forward[neighbor] = new_distance
+                        forward_parent[neighbor] = current
+                        heapq.heappush(forward_pq, (new_distance, neighbor))
+                    if neighbor in backward and new_distance + backward[neighbor] < best:
+                        best = new_distance + backward[neighbor]
+                        meeting = neighbor
+            else:
+                current_distance, current = heapq.heappop(backward_pq)
+                if current in backward_done:
+                    continue
+                backward_done.add(current)
+                self.nodes_expanded += 1
+                for k in range(rev_offsets[current], rev_offsets[current + 1]):
+                    slot = rev_slots[k]
+                    if blocked[slot]:
+                        continue
+                    neighbor = rev_sources[slot]
+                    new_distance = current_distance + weights[slot]
+                    if new_distance < backward.get(neighbor, float('inf')):
+                        backward[neighbor] = new_distance
+                        backward_parent[neighbor] = current
+                        heapq.heappush(backward_pq, (new_distance, neighbor))
+                    if neighbor in forward and new_distance + forward[neighbor] < best:
+                        best = new_distance + forward[neighbor]
+                        meeting = neighbor
+        
+        if meeting == -1:
+            return []
         
-        route = []
-        current = end_star_id
+        path = self._reconstruct_path(forward_parent, meeting)
+        current = backward_parent[meeting]
+        while current != -1:
+            path.append(current)
+            current = backward_parent[current]
+        return compiled.path_to_ids(path)
+    
+    def find_route_a_star(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        end = compiled.star_index(end_star_id)
+        if end is None:
+            return []
         
-
-        if distances[end_star_id] == float('inf'):
+        xs = compiled.xs
+        ys = compiled.ys
+        scale = compiled.heuristic_scale()
+        end_x = xs[end]
+        end_y = ys[end]
+        
+        def heuristic(star):
+            return scale * math.hypot(xs[star] - end_x, ys[star] - end_y)
+        
+        return self._a_star(compiled, start_star_id, end_star_id, heuristic)
+    
+    def find_route_alt(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        end = compiled.star_index(end_star_id)
+        if end is None:
             return []
         
-        while current is not None:
-            route.append(current)
-            current = previous.get(current)
+        if self.graph.landmarks is None:
+            self.graph.prepare_landmarks()
+        landmarks = self.graph.landmarks
+        
+        def heuristic(star):
+            return landmarks.lower_bound(star, end)
         
-        return route[::-1]  
+        return self._a_star(compiled, start_star_id, end_star_id, heuristic)
     
-    def _a_star_search(self, start_star_id, end_star_id):
-        start_star_id = str(start_star_id)
-        end_star_id = str(end_star_id)
+    def _a_star(self, compiled, start_star_id, end_star_id, heuristic):
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        self.nodes_expanded = 0
         
-        if start_star_id == end_star_id:
-            return [start_star_id]
+        if start is None or end is None or not compiled.connected(start, end):
+            return []
         
-        open_set = []
-        heapq.heappush(open_set, (0, start_star_id))
+        if start == end:
+            return [compiled.ids[start]]
         
-        came_from = {}
-        g_score = {star_id: float('inf') for star_id in self.graph.all_stars}
-        g_score[start_star_id] = 0
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
         
-        f_score = {star_id: float('inf') for star_id in self.graph.all_stars}
-        f_score[start_star_id] = self._heuristic(start_star_id, end_star_id)
+        g_score = {start: 0}
+        came_from = {start: -1}
+        closed = set()
+        open_set = [(heuristic(start), 0, start)]
         
         while open_set:
-            current_f, current_star_id = heapq.heappop(open_set)
+            current_f, current_g, current = heapq.heappop(open_set)
+            
+            if current in closed:
+                continue
             
-            if current_star_id == end_star_id:
-                return self._reconstruct_path(came_from, current_star_id)
+            if current == end:
+                return compiled.path_to_ids(self._reconstruct_path(came_from, current))
             
-            adjacent_stars = self.graph.get_adjacent_stars(current_star_id)
-            for neighbor_id, distance in adjacent_stars:
-                tentative_g_score = g_score[current_star_id] + distance
+            closed.add(current)
+            self.nodes_expanded += 1
+            
+            for k in range(offsets[current], offsets[current + 1]):
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                if neighbor in closed:
+                    continue
                 
-                if tentative_g_score < g_score[neighbor_id]:
-                    came_from[neighbor_id] = current_star_id
-                    g_score[neighbor_id] = tentative_g_score
-                    f_score[neighbor_id] = tentative_g_score + self._heuristic(neighbor_id, end_star_id)
-                    
-                    if neighbor_id not in [i[1] for i in open_set]:
-                        heapq.heappush(open_set, (f_score[neighbor_id], neighbor_id))
+                tentative_g_score = current_g + weights[k]
+                if tentative_g_score < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative_g_score
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor), tentative_g_score, neighbor))
         
         return [] 
     
-    def _heuristic(self, star1_id, star2_id):
-        star1 = self.graph.get_star_by_id(star1_id)
-        star2 = self.graph.get_star_by_id(star2_id)
-        
-        if star1 and star2:
-            dx = star1.coordinates['x'] - star2.coordinates['x']
-            dy = star1.coordinates['y'] - star2.coordinates['y']
-            return (dx**2 + dy**2) ** 0.5
-        return float('inf')
-    
-    def _reconstruct_path(self, came_from, current_star_id):
-        path = [current_star_id]
-        while current_star_id in came_from:
-            current_star_id = came_from[current_star_id]
-            path.append(current_star_id)
+    def _reconstruct_path(self, came_from, current):
+        path = [current]
+        while came_from[current] != -1:
+            current = came_from[current]
+            path.append(current)
         return path[::-1]
-    
-    def _calculate_star_efficiency(self, distance, burro):
- 
-        if burro.current_energy < 30:
-            return 1000 / distance 
-        else:
-            return 100 / distance
\ No newline at end of file
@@ -0,0 +1,125 @@
+import heapq
+import time
+from array import array
+from models.burro_state import BurroState, travel, visit
+
+
+class ReachabilityMap:
+    # Optimistic "how far can this burro get" map from one start star, built
+    # in a single Dijkstra-like pass. Each star keeps one resource label, the
+    # componentwise best (energy, grass, life) it can be reached with, and a
+    # label is pushed on to the neighbors with the journey transitions
+    # whenever it improves. Because that label dominates every real arrival
+    # and the transitions are monotone (the same premise as the planners'
+    # dominance pruning), a star left unreachable here cannot be reached by
+    # any route the planners consider.
+    #
+    # Research gains would let walks that circle between two stars raise
+    # their life forever, so instead every positive research effect is
+    # credited once, up front, to the starting life and only losses apply at
+    # each visit. An elementary route can never collect more than that.
+    #
+    # Per star: min_distance is the shortest distance it can be reached with
+    # (a lower bound on the life the trip needs), best_energy and best_life
+    # upper bounds on what is left on arrival. max_stars_bound caps the
+    # length of any route from the start.
+    #
+    # Eating between two stars can creep a label up by ever smaller steps,
+    # so a star whose label has grown WIDEN_AFTER times jumps straight to
+    # the caps (full energy, starting grass, credited life). That only makes
+    # the map more optimistic and bounds the number of updates.
+    #
+    # build() can be given a deadline and an update budget; a map cut short
+    # would wrongly mark stars unreachable, so it returns None instead and
+    # callers plan without one.
+    WIDEN_AFTER = 8
+
+    def __init__(self, compiled, start):
+        count = len(compiled)
+        self.compiled = compiled
+        self.start = start
+        self.reachable = bytearray(count)
+        self.min_distance = array('d', [float('inf')]) * count
+        self.best_energy = array('d', [0.0]) * count
+        self.best_life = array('d', [float('-inf')]) * count
+        self.updates = 0
+
+    @classmethod
+    def build(cls, compiled, start, state, alive=True, deadline=None, update_budget=None):
+        reach = cls(compiled, start)
+        reach.reachable[start] = 1
+        reach.min_distance[start] = 0
+        if not alive or state.is_dead():
+            reach.best_energy[start] = state.energy
+            reach.best_life[start] = state.remaining_life
+            return reach
+
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
+        losses = [min(0, effect) for effect in compiled.research_effect]
+        credit = sum(max(0, effect) for effect in compiled.research_effect)
+
+        caps = BurroState(100, state.grass, state.remaining_life + credit)
+        labels = {start: BurroState(state.energy, state.grass, caps.remaining_life)}
+        grown = {}
+        queued = {start}
+        pq = [(0, start)]
+        pops = 0
+        while pq:
+            pops += 1
+            if update_budget is not None and reach.updates > update_budget:
+                return None
+            if deadline is not None and pops % 256 == 0 and time.monotonic() > deadline:
+                return None
+            _, star = heapq.heappop(pq)
+            queued.discard(star)
+            label = labels[star]
+            distance = reach.min_distance[star]
+            for k in range(offsets[star], offsets[star + 1]):
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                child = travel(label, weights[k])
+                if child.is_dead():
+                    continue
+                target = compiled.stars[neighbor]
+                child = visit(child, target, target.time_to_eat * 0.5, losses[neighbor])
+                if child.is_dead():
+                    continue
+
+                reach.reachable[neighbor] = 1
+                new_distance = distance + weights[k]
+                improved = new_distance < reach.min_distance[neighbor]
+                if improved:
+                    reach.min_distance[neighbor] = new_distance
+                old = labels.get(neighbor)
+                if old is None:
+                    labels[neighbor] = child
+                    improved = True
+                elif not old.dominates(child):
+                    grown[neighbor] = grown.get(neighbor, 0) + 1
+                    if grown[neighbor] >= cls.WIDEN_AFTER:
+                        child = BurroState(*(cap if value > kept else kept
+                                             for value, kept, cap in zip(child, old, caps)))
+                    labels[neighbor] = BurroState(max(old[0], child[0]), max(old[1], child[1]), max(old[2], child[2]))
+                    improved = True
+                if improved and neighbor not in queued:
+                    queued.add(neighbor)
+                    reach.updates += 1
+                    heapq.heappush(pq, (reach.min_distance[neighbor], neighbor))
+
+        for star, label in labels.items():
+            reach.best_energy[star] = label.energy
+            reach.best_life[star] = label.remaining_life
+        return reach
+
+    def is_reachable(self, star):
+        return bool(self.reachable[star])
+
+    def max_stars_bound(self):
+        return sum(self.reachable)
+
+    def unreachable(self):
+        return [i for i in range(len(self.reachable)) if not self.reachable[i]]
@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from models.compiled_graph import StarRecord
+from models.burro_population import BurroPopulation
+
+
+def sample_effects(spec, rng, size):
+    # spec: ("normal", mean, std), ("uniform", low, high),
+    # ("triangular", low, mode, high) or ("choice", values[, probabilities])
+    kind = spec[0]
+    if kind == "normal":
+        return rng.normal(spec[1], spec[2], size)
+    elif kind == "uniform":
+        return rng.uniform(spec[1], spec[2], size)
+    elif kind == "triangular":
+        return rng.triangular(spec[1], spec[2], spec[3], size)
+    elif kind == "choice":
+        return rng.choice(np.asarray(spec[1], dtype=float), size,
+                          p=spec[2] if len(spec) > 2 else None)
+    raise ValueError(f"Distribución desconocida: {kind}")
+
+
+def _replay_chunk(stars, distances, burro, distributions, seed, size):
+    rng = np.random.default_rng(seed)
+    overrides = {star_id: sample_effects(spec, rng, size) for star_id, spec in distributions}
+    population = BurroPopulation(*(np.full(size, value, dtype=float) for value in burro))
+    report = population.run_route(stars, distances, overrides)
+    return report['survival_step'], report['remaining_life']
+
+
+class RouteRobustnessAnalysis:
+    # Monte Carlo replay of one route under uncertain research effects.
+    # Every sample draws an effect for each star with a distribution and
+    # the whole batch is replayed by BurroPopulation; other stars keep their
+    # current (or overridden) effect. Samples are split in chunks with
+    # independent seeds spawned from seed, so the result does not depend on
+    # how many processes run them.
+    CHUNK_SIZE = 25000
+
+    def __init__(self, stars, distances, workers=1):
+        self.stars = [StarRecord(star.id, star.time_to_eat, star.research_effect) for star in stars]
+        self.distances = list(distances)
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, burro, distributions, samples=100000, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), seed=0):
+        # burro: (initial_energy, grass, start_age, death_age)
+        route_ids = {star.id for star in self.stars}
+        distributions = sorted((star_id, spec) for star_id, spec in distributions.items() if star_id in route_ids)
+        sizes = [self.CHUNK_SIZE] * (samples // self.CHUNK_SIZE)
+        if samples % self.CHUNK_SIZE:
+            sizes.append(samples % self.CHUNK_SIZE)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(self.stars, self.distances, tuple(burro), distributions, chunk_seed, size)
+                 for chunk_seed, size in zip(seeds, sizes)]
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                results = list(executor.map(_replay_chunk, *zip(*tasks)))
+        else:
+            results = [_replay_chunk(*task) for task in tasks]
+
+        if not results:
+            return None
+        survival_step = np.concatenate([steps for steps, _ in results])
+        remaining_life = np.concatenate([life for _, life in results])
+        survived = survival_step == -1
+        death_steps = np.bincount(survival_step[~survived], minlength=len(self.stars))
+        return {
+            'samples': samples,
+            'survival_probability': float(survived.mean()),
+            'remaining_life_quantiles': dict(zip(quantiles, np.quantile(remaining_life, quantiles).tolist())),
+            'survivor_life_quantiles': (dict(zip(quantiles, np.quantile(remaining_life[survived], quantiles).tolist()))
+                                        if survived.any() else None),
+            # How many samples died at each step of the route
+            'deaths_by_step': death_steps.tolist()
+        }
@@ -0,0 +1,187 @@
+import math
+import os
+import random
+import time
+from models.compiled_graph import worker_pool, worker_graph
+from models.burro_state import BurroState, travel, visit
+
+
+def _anneal_worker(task):
+    return RouteAnnealer(worker_graph()).run(*task)
+
+
+class RouteAnnealer:
+    # Simulated annealing over routes that follow open links from a fixed
+    # start. A route is scored by replaying it with the burro rules: the
+    # stars reached alive count first, distance only breaks ties, and
+    # whatever lies past the death point is cut off. Moves extend, insert,
+    # remove, 2-opt reverse, or-opt relocate and re-grow the tail; a move is
+    # only tried when every link it creates exists and is open.
+    MOVES = ('extend', 'insert', 'remove', 'two_opt', 'or_opt', 'regrow')
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.distance_scale = 1.0 / (sum(compiled.weights) + 1)
+
+    def score(self, route, state):
+        # Returns (score, survivable prefix of route)
+        compiled = self.compiled
+        distance = 0
+        for k in range(1, len(route)):
+            weight = compiled.edge_weight(route[k - 1], route[k])
+            if weight is None:
+                return self._scored(route[:k], distance)
+            state = travel(state, weight)
+            if state.is_dead():
+                return self._scored(route[:k], distance)
+            star = compiled.stars[route[k]]
+            state = visit(state, star, star.time_to_eat * 0.5)
+            if state.is_dead():
+                return self._scored(route[:k], distance)
+            distance += weight
+        return self._scored(route, distance)
+
+    def _scored(self, route, distance):
+        return len(route) - distance * self.distance_scale, route
+
+    def run(self, route, state, seed, iterations, temperature, cooling):
+        # One annealing epoch; returns (best route, best score, final route, temperature)
+        rng = random.Random(seed)
+        state = BurroState(*state)
+        current_score, current = self.score(list(route), state)
+        best_score, best = current_score, current
+
+        for _ in range(iterations):
+            candidate = getattr(self, '_' + rng.choice(self.MOVES))(current, rng)
+            if candidate is not None:
+                candidate_score, candidate = self.score(candidate, state)
+                delta = candidate_score - current_score
+                if delta >= 0 or rng.random() < math.exp(delta / max(temperature, 1e-9)):
+                    current, current_score = candidate, candidate_score
+                    if current_score > best_score:
+                        best, best_score = current, current_score
+            temperature *= cooling
+        return best, best_score, current, temperature
+
+    def _linked(self, i, j):
+        return self.compiled.edge_weight(i, j) is not None
+
+    def _open_neighbors(self, star, excluded):
+        return [neighbor for neighbor, _ in self.compiled.adjacent(star) if neighbor not in excluded]
+
+    def _extend(self, route, rng):
+        options = self._open_neighbors(route[-1], set(route))
+        return route + [rng.choice(options)] if options else None
+
+    def _insert(self, route, rng):
+        if len(route) < 2:
+            return None
+        k = rng.randrange(1, len(route))
+        options = [star for star in self._open_neighbors(route[k - 1], set(route))
+                   if self._linked(star, route[k])]
+        return route[:k] + [rng.choice(options)] + route[k:] if options else None
+
+    def _remove(self, route, rng):
+        if len(route) < 2:
+            return None
+        k = rng.randrange(1, len(route))
+        if k < len(route) - 1 and not self._linked(route[k - 1], route[k + 1]):
+            return None
+        return route[:k] + route[k + 1:]
+
+    def _two_opt(self, route, rng):
+        if len(route) < 3:
+            return None
+        i = rng.randrange(1, len(route) - 1)
+        j = rng.randrange(i + 1, len(route))
+        candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+        return candidate if self._valid(candidate, i - 1, j + 1) else None
+
+    def _or_opt(self, route, rng):
+        if len(route) < 3:
+            return None
+        length = rng.randint(1, min(3, len(route) - 1))
+        i = rng.randrange(1, len(route) - length + 1)
+        segment = route[i:i + length]
+        rest = route[:i] + route[i + length:]
+        k = rng.randrange(1, len(rest) + 1)
+        candidate = rest[:k] + segment + rest[k:]
+        return candidate if candidate != route and self._valid(candidate, 0, len(candidate) - 1) else None
+
+    def _regrow(self, route, rng):
+        # Cut the route somewhere and walk randomly from there
+        candidate = route[:rng.randrange(1, len(route) + 1)]
+        visited = set(candidate)
+        for _ in range(rng.randint(1, 8)):
+            options = self._open_neighbors(candidate[-1], visited)
+            if not options:
+                break
+            candidate.append(rng.choice(options))
+            visited.add(candidate[-1])
+        return candidate
+
+    def _valid(self, route, first, last):
+        last = min(last, len(route) - 1)
+        return all(self._linked(route[k], route[k + 1]) for k in range(max(first, 0), last))
+
+
+class RouteImprover:
+    # Island-model annealing on top of RouteAnnealer. Every island anneals
+    # its own copy of the route for a fixed number of iterations per epoch,
+    # then the best route of each island migrates to the next one on a ring
+    # if it beats that island's current route. Islands run on a process pool
+    # that receives the compiled graph once per worker. Epoch seeds derive
+    # from seed, so a given seed and number of epochs always yields the same
+    # route; time_budget only decides how many epochs run.
+    def __init__(self, compiled, islands=4, workers=1, seed=0, iterations=2000,
+                 temperature=1.0, cooling=0.999):
+        self.compiled = compiled
+        self.islands = islands
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.iterations = iterations
+        self.temperature = temperature
+        self.cooling = cooling
+        self.epochs_run = 0
+
+    def improve(self, route, state, time_budget=None, epochs=None):
+        annealer = RouteAnnealer(self.compiled)
+        best_score, best = annealer.score(list(route), state)
+        if time_budget is None and epochs is None:
+            epochs = 1
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+        currents = [best] * self.islands
+        temperatures = [self.temperature] * self.islands
+        executor = None
+        if self.workers > 1:
+            executor = worker_pool(self.compiled, min(self.workers, self.islands))
+        try:
+            self.epochs_run = 0
+            while epochs is None or self.epochs_run < epochs:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                tasks = [(currents[island], tuple(state), f"{self.seed}-{island}-{self.epochs_run}",
+                          self.iterations, temperatures[island], self.cooling)
+                         for island in range(self.islands)]
+                if executor is None:
+                    results = [annealer.run(*task) for task in tasks]
+                else:
+                    results = list(executor.map(_anneal_worker, tasks))
+
+                for island, (island_best, island_score, current, temperature) in enumerate(results):
+                    currents[island] = current
+                    temperatures[island] = temperature
+                    if island_score > best_score:
+                        best_score, best = island_score, island_best
+
+                # Ring migration
+                for island, (island_best, island_score, _, _) in enumerate(results):
+                    target = (island + 1) % self.islands
+                    if island_score > annealer.score(currents[target], state)[0]:
+                        currents[target] = island_best
+                self.epochs_run += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return best
@@ -0,0 +1,100 @@
+import numpy as np
+from models.burro_state import travel, visit
+
+
+class RouteScorer:
+    # Efficiency scoring for find_optimal_route. Star attributes live in
+    # NumPy arrays indexed like the compiled graph and the CSR arrays are
+    # wrapped without copying (the blocked mask stays live), so the
+    # efficiency of every open neighbor of a star comes from one batch of
+    # array operations instead of a lookup and a call per neighbor.
+    #
+    # choose() looks depth stars ahead: each of the beam_width best-scored
+    # neighbors is simulated with the BurroState transitions and valued as
+    # its own efficiency plus the best continuation below it, a branch that
+    # kills the burro contributing nothing. With depth 1 it is the plain
+    # greedy choice. The work per step is bounded by beam_width ** (depth - 1)
+    # batch evaluations, whatever the size of the map.
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.time_to_eat = np.frombuffer(compiled.time_to_eat, dtype=float)
+        self.research_effect = np.frombuffer(compiled.research_effect, dtype=float)
+        self.hypergiant = np.frombuffer(compiled.hypergiant, dtype=bool)
+
+        self.time_factor = 5.0 / (self.time_to_eat + 1)
+        self.research_factor = 1.0 + self.research_effect * 0.1
+        self.low_energy_factor = np.maximum(1.0, self.research_effect * 2)
+        self.hypergiant_factor = np.where(self.hypergiant, 1.5, 1.0)
+
+        self.offsets = np.frombuffer(compiled.offsets, dtype=compiled.offsets.typecode)
+        self.neighbors = np.frombuffer(compiled.neighbors, dtype=compiled.neighbors.typecode)
+        self.weights = np.frombuffer(compiled.weights, dtype=compiled.weights.typecode)
+        self.blocked = np.frombuffer(compiled.blocked, dtype=np.uint8)
+
+    def candidates(self, star, energy, visited):
+        # (neighbor indices, distances, efficiencies) of open, unvisited links
+        start, end = self.offsets[star], self.offsets[star + 1]
+        neighbors = self.neighbors[start:end]
+        distances = self.weights[start:end]
+        keep = (self.blocked[start:end] == 0) & ~visited[neighbors]
+        neighbors = neighbors[keep]
+        distances = distances[keep]
+
+        energy_factor = self.low_energy_factor[neighbors] if energy < 30 else 1.0
+        efficiency = ((100.0 / (distances + 1)) * 0.4 +
+                      energy_factor * 0.2 +
+                      self.research_factor[neighbors] * 0.2 +
+                      self.time_factor[neighbors] * 0.1 +
+                      self.hypergiant_factor[neighbors] * 0.1)
+        if energy < 20:
+            efficiency = np.where(distances > 100, efficiency * 0.5, efficiency)
+        return neighbors, distances, efficiency
+
+    def step(self, state, distance, neighbor):
+        state = travel(state, distance)
+        if state.is_dead():
+            return None
+        star = self.compiled.stars[neighbor]
+        state = visit(state, star, star.time_to_eat * 0.5)
+        if state.is_dead():
+            return None
+        return state
+
+    def choose(self, star, state, visited, depth=1, beam_width=3):
+        # Returns (neighbor, distance) or None when no open neighbor is left
+        neighbors, distances, efficiency = self.candidates(star, state.energy, visited)
+        if len(neighbors) == 0:
+            return None
+
+        # Best efficiency first, shorter link on ties, then adjacency order
+        order = np.lexsort((np.arange(len(neighbors)), distances, -efficiency))
+        if depth <= 1:
+            return int(neighbors[order[0]]), float(distances[order[0]])
+
+        best = None
+        best_value = -float('inf')
+        for k in order[:beam_width]:
+            value = efficiency[k] + self._continuation(int(neighbors[k]), float(distances[k]),
+                                                       state, visited, depth - 1, beam_width)
+            if value > best_value:
+                best_value = value
+                best = (int(neighbors[k]), float(distances[k]))
+        return best
+
+    def _continuation(self, neighbor, distance, state, visited, depth, beam_width):
+        state = self.step(state, distance, neighbor)
+        if state is None:
+            return -float('inf')
+        if depth == 0:
+            return 0.0
+
+        visited[neighbor] = True
+        neighbors, distances, efficiency = self.candidates(neighbor, state.energy, visited)
+        best = 0.0
+        if len(neighbors):
+            order = np.argsort(-efficiency, kind='stable')[:beam_width]
+            for k in order:
+                best = max(best, efficiency[k] + self._continuation(int(neighbors[k]), float(distances[k]),
+                                                                    state, visited, depth - 1, beam_width))
+        visited[neighbor] = False
+        return best
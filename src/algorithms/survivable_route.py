@@ -0,0 +1,117 @@
+import heapq
+import time
+from algorithms.max_stars_search import MaxStarsSearch
+
+
+class SurvivableRouteSearch:
+    # Label-setting resource-constrained shortest path. A label is
+    # (distance, BurroState, visited bitset) at a star, extended with the same
+    # travel + visit_star transitions the step-by-step journey applies, and
+    # dropped as soon as the burro dies. Labels at a star are Pareto-pruned:
+    # one is discarded when another label there is no longer, has at least as
+    # much energy, grass and life, and visited a subset of its stars (so every
+    # continuation stays open to it). Routes are elementary.
+    #
+    # Labels are popped by distance plus the plain distance left to the
+    # target, a consistent bound, so the first label that reaches the target
+    # is the shortest survivable route. If the queue runs dry, no survivable
+    # route exists and proven is True; a label_budget or time_budget can cut
+    # the search short, in which case proven stays False.
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.expander = MaxStarsSearch(compiled)
+        self.labels_created = 0
+        self.labels_pruned = 0
+        self.proven = False
+
+    def search(self, start, target, state, alive=True, label_budget=None, reach=None,
+               time_budget=None):
+        # Returns (path of star indices, distance, final state) or None. An
+        # optional ReachabilityMap of start rules stars out up front.
+        self.labels_created = 0
+        self.labels_pruned = 0
+        self.proven = True
+        if not alive or state.is_dead():
+            return None
+        if start == target:
+            return [start], 0, state
+        reachable = reach.reachable if reach is not None else None
+        if reachable is not None and not reachable[target]:
+            return None
+
+        compiled = self.compiled
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
+        to_target = compiled.distances_to(target)
+        if to_target[start] == float('inf'):
+            return None
+
+        # labels[i] = [star, parent label, distance, state, mask, alive]
+        labels = [[start, -1, 0, state, 1 << start, True]]
+        at_star = {start: [0]}
+        pq = [(to_target[start], 0, 0)]
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        pops = 0
+        while pq:
+            pops += 1
+            if deadline is not None and pops % 256 == 0 and time.monotonic() > deadline:
+                self.proven = False
+                return None
+            _, _, label_id = heapq.heappop(pq)
+            star, _, distance, state, mask, live = labels[label_id]
+            if not live:
+                continue
+            if star == target:
+                return self._path(labels, label_id), distance, state
+
+            for k in range(offsets[star], offsets[star + 1]):
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                if mask >> neighbor & 1 or to_target[neighbor] == float('inf'):
+                    continue
+                if reachable is not None and not reachable[neighbor]:
+                    continue
+                child_state = self.expander.expand(state, weights[k], neighbor)
+                if child_state is None:
+                    continue
+                child = [neighbor, label_id, distance + weights[k], child_state, mask | 1 << neighbor, True]
+                if not self._insert(labels, at_star, child):
+                    continue
+                if label_budget is not None and self.labels_created > label_budget:
+                    self.proven = False
+                    return None
+                heapq.heappush(pq, (child[2] + to_target[neighbor], child[2], len(labels) - 1))
+        return None
+
+    def _insert(self, labels, at_star, child):
+        star, _, distance, state, mask, _ = child
+        kept = []
+        for label_id in at_star.get(star, ()):
+            other = labels[label_id]
+            if not other[5]:
+                continue
+            # Bitsets are as wide as the map, so they are compared last
+            if other[2] <= distance and other[3].dominates(state) and other[4] & ~mask == 0:
+                self.labels_pruned += 1
+                return False
+            if distance <= other[2] and state.dominates(other[3]) and mask & ~other[4] == 0:
+                other[5] = False
+                self.labels_pruned += 1
+                continue
+            kept.append(label_id)
+
+        labels.append(child)
+        kept.append(len(labels) - 1)
+        at_star[star] = kept
+        self.labels_created += 1
+        return True
+
+    def _path(self, labels, label_id):
+        path = []
+        while label_id != -1:
+            path.append(labels[label_id][0])
+            label_id = labels[label_id][1]
+        return path[::-1]
@@ -2,6 +2,7 @@ import math
 import winsound
 import threading
 from utils.constants import Constants
+from models.burro_state import health_for_energy
 
 class Burro:
     def __init__(self, health_state, initial_energy, grass, start_age, death_age):
@@ -123,40 +124,14 @@ class Burro:
     
     def _calculate_travel_energy_cost(self, distance):
         base_cost = distance * 0.1 
-        
-        health_multiplier = {
-            Constants.HEALTH_EXCELLENT: 0.5,  
-            Constants.HEALTH_GOOD: 0.8,       
-            Constants.HEALTH_POOR: 1.5,       
-            Constants.HEALTH_DYING: 3.0,  
-            Constants.HEALTH_DEAD: 0.0
-        }
-        
-        return base_cost * health_multiplier.get(self.health_state, 1.0)
+        return base_cost * Constants.TRAVEL_COST_MULTIPLIERS.get(self.health_state, 1.0)
     
     def _calculate_research_energy_cost(self, research_time):
         base_cost = research_time * 0.2
-        
-        health_multiplier = {
-            Constants.HEALTH_EXCELLENT: 0.7,
-            Constants.HEALTH_GOOD: 1.0,
-            Constants.HEALTH_POOR: 1.8,
-            Constants.HEALTH_DYING: 3.0
-        }
-        
-        return base_cost * health_multiplier.get(self.health_state, 1.0)
+        return base_cost * Constants.RESEARCH_COST_MULTIPLIERS.get(self.health_state, 1.0)
     
     def _update_health_state(self):
-        if self.current_energy >= 75:
-            new_state = Constants.HEALTH_EXCELLENT
-        elif self.current_energy >= 50:
-            new_state = Constants.HEALTH_GOOD
-        elif self.current_energy >= 25:
-            new_state = Constants.HEALTH_POOR
-        elif self.current_energy > 0:
-            new_state = Constants.HEALTH_DYING
-        else:
-            new_state = Constants.HEALTH_DEAD
+        new_state = health_for_energy(self.current_energy)
         
         if self.health_state != new_state:
             self.health_state = new_state
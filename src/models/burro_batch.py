@@ -0,0 +1,48 @@
+import numpy as np
+from utils.constants import Constants
+
+# Health states in code order; codes index the multiplier tables below
+HEALTH_ORDER = (Constants.HEALTH_EXCELLENT, Constants.HEALTH_GOOD, Constants.HEALTH_POOR,
+                Constants.HEALTH_DYING, Constants.HEALTH_DEAD)
+TRAVEL_MULTIPLIERS = np.array([Constants.TRAVEL_COST_MULTIPLIERS.get(health, 1.0) for health in HEALTH_ORDER])
+RESEARCH_MULTIPLIERS = np.array([Constants.RESEARCH_COST_MULTIPLIERS.get(health, 1.0) for health in HEALTH_ORDER])
+ENERGY_FACTORS = np.array([Constants.ENERGY_FACTORS.get(health, 2) for health in HEALTH_ORDER], dtype=float)
+
+
+# Vectorized counterparts of the burro_state transitions: every argument is
+# an array (or a scalar broadcast against them) and each element follows
+# exactly the same arithmetic as the scalar function it mirrors.
+
+def health_codes(energy):
+    return np.select([energy >= 75, energy >= 50, energy >= 25, energy > 0], [0, 1, 2, 3], 4)
+
+
+def is_dead(energy, life):
+    return (energy <= 0) | (life <= 0)
+
+
+def travel(energy, grass, life, distance):
+    dead = is_dead(energy, life)
+    cost = distance * 0.1 * TRAVEL_MULTIPLIERS[health_codes(energy)]
+    new_energy = np.where(dead, energy, np.maximum(0, energy - cost))
+    new_life = np.where(dead, life, life - distance)
+    return new_energy, grass, new_life
+
+
+def visit(energy, grass, life, time_to_eat, research_time, research_effect):
+    dead = is_dead(energy, life)
+
+    eating = ~dead & (energy < 50) & (grass > 0)
+    factor = ENERGY_FACTORS[health_codes(energy)]
+    safe_factor = np.where(factor > 0, factor, 1)
+    eaten = np.minimum(np.minimum(time_to_eat * Constants.MAX_EATING_TIME_RATIO, grass),
+                       (50 - energy) / safe_factor)
+    eating &= eaten > 0
+    energy = np.where(eating, np.minimum(100, energy + eaten * factor), energy)
+    grass = np.where(eating, grass - eaten, grass)
+
+    researching = ~dead & (research_time > 0)
+    cost = research_time * 0.2 * RESEARCH_MULTIPLIERS[health_codes(energy)]
+    energy = np.where(researching, np.maximum(0, energy - cost), energy)
+    life = np.where(researching, life + research_effect, life)
+    return energy, grass, life
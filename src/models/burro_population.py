@@ -0,0 +1,92 @@
+import numpy as np
+from utils.constants import Constants
+from models import burro_batch
+
+DEAD = burro_batch.HEALTH_ORDER.index(Constants.HEALTH_DEAD)
+
+
+class BurroPopulation:
+    # Struct-of-arrays stand-in for N Burro objects that share a route.
+    # Every field is a NumPy array with one slot per run and health states
+    # are small ints (codes of burro_batch.HEALTH_ORDER), refreshed after
+    # each change exactly like Burro._update_health_state. Runs that are dead
+    # (health, remaining life or age) are left untouched, as the Burro
+    # methods return early for them.
+    def __init__(self, initial_energy, grass, start_age, death_age):
+        initial_energy, grass, start_age, death_age = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (initial_energy, grass, start_age, death_age)))
+        self.energy = initial_energy.copy()
+        self.grass = grass.copy()
+        self.age = start_age.copy()
+        self.death_age = death_age.copy()
+        self.remaining_life = death_age - start_age
+        self.health = burro_batch.health_codes(self.energy).astype(np.int8)
+        self.stars_visited = np.zeros(len(self), dtype=np.int32)
+        self.distance_traveled = np.zeros(len(self))
+        # Index of the route hop each run died on, -1 while alive
+        self.survival_step = np.full(len(self), -1, dtype=np.int32)
+
+    def __len__(self):
+        return self.energy.shape[0]
+
+    def is_dead(self):
+        return ((self.health == DEAD) | (self.remaining_life <= 0) |
+                (self.age >= self.death_age))
+
+    def travel(self, distance):
+        alive = ~self.is_dead()
+        energy, _, life = burro_batch.travel(self.energy, self.grass, self.remaining_life, distance)
+        self.energy = np.where(alive, energy, self.energy)
+        self.remaining_life = np.where(alive, life, self.remaining_life)
+        self.distance_traveled = np.where(alive, self.distance_traveled + distance, self.distance_traveled)
+        self.health = burro_batch.health_codes(self.energy).astype(np.int8)
+        return ~self.is_dead()
+
+    def visit_star(self, star, research_time=0, research_effect_override=None, first_visit=True):
+        alive = ~self.is_dead()
+        if first_visit:
+            self.stars_visited += alive
+
+        effect = star.research_effect
+        if research_effect_override is not None:
+            # NaN marks runs without an override for this star
+            override = np.asarray(research_effect_override, dtype=float)
+            effect = np.where(np.isnan(override), star.research_effect, override)
+        energy, grass, life = burro_batch.visit(self.energy, self.grass, self.remaining_life,
+                                                star.time_to_eat, research_time, effect)
+        self.energy = np.where(alive, energy, self.energy)
+        self.grass = np.where(alive, grass, self.grass)
+        self.remaining_life = np.where(alive, life, self.remaining_life)
+        self.health = burro_batch.health_codes(self.energy).astype(np.int8)
+        return ~self.is_dead()
+
+    def run_route(self, stars, distances, research_overrides=None):
+        # Replays a journey like ControlPanel does: the start star is visited
+        # without research, then each hop is a travel followed by a visit
+        # with research_time = time_to_eat * 0.5. research_overrides maps a
+        # star id to one override per run (or a scalar).
+        research_overrides = research_overrides or {}
+        seen = {stars[0].id}
+        self.visit_star(stars[0])
+        self._mark_deaths(0)
+        for step, (star, distance) in enumerate(zip(stars[1:], distances), start=1):
+            self.travel(distance)
+            self._mark_deaths(step)
+            self.visit_star(star, star.time_to_eat * 0.5, research_overrides.get(star.id),
+                            first_visit=star.id not in seen)
+            seen.add(star.id)
+            self._mark_deaths(step)
+        return self.report()
+
+    def _mark_deaths(self, step):
+        self.survival_step = np.where((self.survival_step == -1) & self.is_dead(), step, self.survival_step)
+
+    def report(self):
+        return {
+            'survival_step': self.survival_step,
+            'final_energy': self.energy,
+            'stars_visited': self.stars_visited,
+            'remaining_life': self.remaining_life,
+            'grass': self.grass,
+            'health': self.health
+        }
@@ -0,0 +1,89 @@
+from operator import itemgetter
+from utils.constants import Constants
+
+
+def health_for_energy(energy):
+    if energy >= 75:
+        return Constants.HEALTH_EXCELLENT
+    elif energy >= 50:
+        return Constants.HEALTH_GOOD
+    elif energy >= 25:
+        return Constants.HEALTH_POOR
+    elif energy > 0:
+        return Constants.HEALTH_DYING
+    return Constants.HEALTH_DEAD
+
+
+class BurroState(tuple):
+    # Immutable (energy, grass, remaining_life) snapshot used by the planners.
+    # The health state is always derived from energy, exactly as
+    # Burro._update_health_state does after every change. The age check of
+    # Burro.is_dead never changes during a journey, so callers test it once
+    # on the real Burro before planning.
+    __slots__ = ()
+
+    def __new__(cls, energy, grass, remaining_life):
+        return tuple.__new__(cls, (energy, grass, remaining_life))
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    energy = property(itemgetter(0))
+    grass = property(itemgetter(1))
+    remaining_life = property(itemgetter(2))
+
+    @classmethod
+    def from_burro(cls, burro):
+        return cls(burro.current_energy, burro.grass, burro.remaining_life)
+
+    @property
+    def health_state(self):
+        return health_for_energy(self[0])
+
+    def is_dead(self):
+        return self[0] <= 0 or self[2] <= 0
+
+    def dominates(self, other):
+        return self[0] >= other[0] and self[1] >= other[1] and self[2] >= other[2]
+
+    def __repr__(self):
+        return f"BurroState(energy={self[0]}, grass={self[1]}, remaining_life={self[2]})"
+
+
+def travel(state, distance):
+    # Mirrors Burro.travel
+    if state.is_dead():
+        return state
+    energy, grass, life = state
+    cost = distance * 0.1 * Constants.TRAVEL_COST_MULTIPLIERS.get(health_for_energy(energy), 1.0)
+    return BurroState(max(0, energy - cost), grass, life - distance)
+
+
+def eat(state, star):
+    # Mirrors Burro._auto_eat_grass
+    energy, grass, life = state
+    factor = Constants.ENERGY_FACTORS.get(health_for_energy(energy), 2)
+    max_eating_time = star.time_to_eat * Constants.MAX_EATING_TIME_RATIO
+    eaten = min(max_eating_time, grass, (50 - energy) / factor)
+    if eaten > 0:
+        return BurroState(min(100, energy + eaten * factor), grass - eaten, life)
+    return state
+
+
+def research(state, research_time, research_effect):
+    # Mirrors Burro.do_research
+    energy, grass, life = state
+    cost = research_time * 0.2 * Constants.RESEARCH_COST_MULTIPLIERS.get(health_for_energy(energy), 1.0)
+    return BurroState(max(0, energy - cost), grass, life + research_effect)
+
+
+def visit(state, star, research_time=0, research_effect_override=None):
+    # Mirrors Burro.visit_star
+    if state.is_dead():
+        return state
+    if state[0] < 50 and state[1] > 0:
+        state = eat(state, star)
+    if research_time > 0:
+        effect = research_effect_override if research_effect_override is not None else star.research_effect
+        state = research(state, research_time, effect)
+    return state
@@ -0,0 +1,371 @@
+import bisect
+import hashlib
+import heapq
+import math
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Planner-facing star attributes for snapshots rebuilt outside the StarGraph
+StarRecord = namedtuple('StarRecord', ['id', 'time_to_eat', 'research_effect'])
+
+_worker_compiled = None
+
+
+def _init_worker(payload, initializer, initargs):
+    # Runs once per worker process: the graph arrives here, never per task
+    global _worker_compiled
+    _worker_compiled = CompiledGraph.from_payload(payload)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def worker_pool(compiled, max_workers, initializer=None, initargs=()):
+    # Process pool whose workers share one copy of compiled, read back with
+    # worker_graph(); initializer runs after the graph is in place
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                               initargs=(compiled.to_payload(), initializer, initargs))
+
+
+def worker_graph():
+    return _worker_compiled
+
+
+def edge_key(i, j):
+    # One int per undirected link between star indices i and j
+    return (i << 32) | j if i < j else (j << 32) | i
+
+
+class CompiledGraph:
+    # Read-only CSR snapshot of a StarGraph. Stars are addressed by dense
+    # integer indices; the neighbors of star i live in
+    # neighbors[offsets[i]:offsets[i + 1]] with matching weights. A blocked
+    # mask is kept per adjacency slot so traversals never build edge tuples.
+    # The reverse index lists, for every star, the slots of its incoming
+    # links (rev_slots), so backward searches share weights and the mask.
+    # The slots of each undirected link are found by bisecting pair_keys, the
+    # sorted edge keys of all slots, with pair_slots alongside.
+    # Connected components over open links are labeled lazily and then
+    # updated in place as links are blocked or unblocked.
+    #
+    # Coordinates and the attributes planners read in bulk (time_to_eat,
+    # research_effect, hypergiant) are flat arrays too, gathered straight
+    # from the StarStore columns and edge table rather than through Star.
+    def __init__(self, graph):
+        # Star indices are the ones StarGraph interned at load time. The id
+        # list and index are the graph's own: it only ever appends to them,
+        # so the first len(self) entries stay valid for this snapshot.
+        self.ids = graph.ids
+        self.stars = list(graph.all_stars.values())
+        self.index = graph.star_indices
+        self._read_columns()
+        self._heuristic_scale = None
+        self._components = None
+
+        self.offsets = array('l', [0])
+        self.neighbors = array('l')
+        self.weights = array('d')
+
+        for star in self.stars:
+            store = star.store
+            for link in store.link_rows(star.row):
+                j = graph.index_of(store.link_targets[link])
+                if j is None:
+                    continue
+                self.neighbors.append(j)
+                self.weights.append(store.link_distance.item(link))
+            self.offsets.append(len(self.neighbors))
+
+        self._index_pairs()
+        self.blocked = bytearray(len(self.neighbors))
+        for key in graph.blocked_keys:
+            self.set_pair_blocked(key >> 32, key & 0xFFFFFFFF, True)
+
+    def _read_columns(self):
+        stars = self.stars
+        store = stars[0].store if stars else None
+        if store is not None and all(star.store is store for star in stars):
+            rows = np.fromiter((star.row for star in stars), dtype=np.int64, count=len(stars))
+            column = lambda values: array('d', values[rows].astype(float).tobytes())
+            self.xs = column(store.columns['x'])
+            self.ys = column(store.columns['y'])
+            self.time_to_eat = column(store.columns['time_to_eat'])
+            self.research_effect = column(store.columns['research_effect'])
+            self.hypergiant = bytearray(store.hypergiant[rows].tobytes())
+        else:
+            # Stars from several stores, e.g. built one by one
+            self.xs = array('d', [star.coordinates['x'] for star in stars])
+            self.ys = array('d', [star.coordinates['y'] for star in stars])
+            self.time_to_eat = array('d', [star.time_to_eat for star in stars])
+            self.research_effect = array('d', [star.research_effect for star in stars])
+            self.hypergiant = bytearray(bool(star.hypergiant) for star in stars)
+
+    @classmethod
+    def from_payload(cls, payload):
+        (ids, offsets, neighbors, weights, blocked, time_to_eat, research_effect,
+         hypergiant, xs, ys) = payload
+        compiled = cls.__new__(cls)
+        compiled.ids = ids
+        compiled.index = {star_id: i for i, star_id in enumerate(ids)}
+        compiled.xs = array('d', xs)
+        compiled.ys = array('d', ys)
+        compiled.time_to_eat = array('d', time_to_eat)
+        compiled.research_effect = array('d', research_effect)
+        compiled.hypergiant = bytearray(hypergiant)
+        compiled._heuristic_scale = None
+        compiled._components = None
+        compiled.offsets = array('l', offsets)
+        compiled.neighbors = array('l', neighbors)
+        compiled.weights = array('d', weights)
+        compiled.blocked = bytearray(blocked)
+        compiled.stars = [StarRecord(star_id, tte, effect) for star_id, tte, effect
+                          in zip(ids, compiled.time_to_eat, compiled.research_effect)]
+        compiled._index_pairs()
+        return compiled
+
+    def to_payload(self):
+        # Compact picklable form, meant to be shipped once per worker process
+        return (
+            self.ids,
+            self.offsets.tobytes(),
+            self.neighbors.tobytes(),
+            self.weights.tobytes(),
+            bytes(self.blocked),
+            self.time_to_eat.tobytes(),
+            self.research_effect.tobytes(),
+            bytes(self.hypergiant),
+            self.xs.tobytes(),
+            self.ys.tobytes()
+        )
+
+    def _index_pairs(self):
+        count = len(self.offsets) - 1
+        offsets = np.frombuffer(self.offsets, dtype='l')
+        targets = np.frombuffer(self.neighbors, dtype='l')
+        sources = np.repeat(np.arange(count, dtype='l'), np.diff(offsets))
+        self.rev_sources = array('l', sources.tobytes())
+
+        # Counting pass: in-degrees give rev_offsets, then each star's
+        # incoming slots are laid out in slot order
+        incoming = np.bincount(targets, minlength=count)
+        rev_offsets = np.zeros(count + 1, dtype='l')
+        np.cumsum(incoming, out=rev_offsets[1:])
+        self.rev_offsets = array('l', rev_offsets.tobytes())
+        self.rev_slots = array('l', np.argsort(targets, kind='stable').astype('l').tobytes())
+
+        keys = (np.minimum(sources, targets).astype(np.int64) << 32) | np.maximum(sources, targets)
+        order = np.argsort(keys, kind='stable')
+        self.pair_keys = array('q', keys[order].tobytes())
+        self.pair_slots = array('l', order.astype('l').tobytes())
+
+    def slots_for(self, i, j):
+        # Adjacency slots of the link between i and j, in both directions
+        key = edge_key(i, j)
+        start = bisect.bisect_left(self.pair_keys, key)
+        end = start
+        while end < len(self.pair_keys) and self.pair_keys[end] == key:
+            end += 1
+        return self.pair_slots[start:end]
+
+    def signature(self):
+        # Identifies the star ids and links; stored indexes are only reused
+        # while it matches. The blocked mask is deliberately left out.
+        digest = hashlib.sha1()
+        digest.update("\0".join(self.ids[:len(self)]).encode('utf-8'))
+        digest.update(self.offsets.tobytes())
+        digest.update(self.neighbors.tobytes())
+        digest.update(self.weights.tobytes())
+        return digest.hexdigest()
+
+    def heuristic_scale(self):
+        # Largest factor k with k * euclidean(i, j) <= distance(i, j) on every
+        # link, so k * euclidean distance never overestimates a route. Blocked
+        # links are included on purpose: blocking only makes routes longer.
+        if self._heuristic_scale is None:
+            scale = float('inf')
+            for i in range(len(self.offsets) - 1):
+                for slot in range(self.offsets[i], self.offsets[i + 1]):
+                    j = self.neighbors[slot]
+                    straight = math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j])
+                    if straight > 0:
+                        scale = min(scale, self.weights[slot] / straight)
+            # Shave a little off so rounding never makes the bound inconsistent
+            self._heuristic_scale = 0.0 if scale == float('inf') else scale * (1 - 1e-9)
+        return self._heuristic_scale
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def star_index(self, star_id):
+        index = self.index.get(star_id)
+        if index is None and not isinstance(star_id, str):
+            index = self.index.get(str(star_id))
+        return index
+
+    def star_id(self, index):
+        return self.ids[index]
+
+    def set_edge_blocked(self, star1_id, star2_id, blocked):
+        i = self.star_index(star1_id)
+        j = self.star_index(star2_id)
+        if i is not None and j is not None:
+            self.set_pair_blocked(i, j, blocked)
+
+    def set_pair_blocked(self, i, j, blocked):
+        flag = 1 if blocked else 0
+        changed = False
+        for slot in self.slots_for(i, j):
+            if self.blocked[slot] != flag:
+                self.blocked[slot] = flag
+                changed = True
+        if changed and self._components is not None and i != j:
+            if blocked:
+                self._split_component(i, j)
+            else:
+                self._merge_components(i, j)
+
+    def _linked(self, node):
+        # Stars joined to node by an open link in either direction
+        blocked = self.blocked
+        neighbors = self.neighbors
+        rev_sources = self.rev_sources
+        rev_slots = self.rev_slots
+        for slot in range(self.offsets[node], self.offsets[node + 1]):
+            if not blocked[slot]:
+                yield neighbors[slot]
+        for k in range(self.rev_offsets[node], self.rev_offsets[node + 1]):
+            slot = rev_slots[k]
+            if not blocked[slot]:
+                yield rev_sources[slot]
+
+    def components(self):
+        # Component label per star. Links count in both directions, so for
+        # one-way links a shared label is only a necessary condition for a
+        # route; two stars with different labels are never connected.
+        #
+        # The labeling is built once and then kept up to date: an unblock
+        # relabels the smaller of the two components it joins, and a block
+        # runs two searches from its endpoints in lockstep. If they meet
+        # nothing changed; otherwise the side that ran out first is the
+        # split-off part and is the only one relabeled.
+        if self._components is None:
+            labels = array('l', [-1]) * len(self)
+            sizes = []
+            for root in range(len(self)):
+                if labels[root] != -1:
+                    continue
+                label = len(sizes)
+                labels[root] = label
+                size = 1
+                frontier = deque([root])
+                while frontier:
+                    for neighbor in self._linked(frontier.popleft()):
+                        if labels[neighbor] == -1:
+                            labels[neighbor] = label
+                            size += 1
+                            frontier.append(neighbor)
+                sizes.append(size)
+            self._components = (labels, sizes)
+        return self._components[0]
+
+    def _merge_components(self, i, j):
+        labels, sizes = self._components
+        if labels[i] == labels[j]:
+            return
+        if sizes[labels[i]] > sizes[labels[j]]:
+            i, j = j, i
+        small, large = labels[i], labels[j]
+        labels[i] = large
+        frontier = deque([i])
+        while frontier:
+            for neighbor in self._linked(frontier.popleft()):
+                if labels[neighbor] == small:
+                    labels[neighbor] = large
+                    frontier.append(neighbor)
+        sizes[large] += sizes[small]
+        sizes[small] = 0
+
+    def _split_component(self, i, j):
+        labels, sizes = self._components
+        sides = [(deque([i]), {i}), (deque([j]), {j})]
+        while True:
+            for side in (0, 1):
+                frontier, seen = sides[side]
+                other = sides[1 - side][1]
+                if not frontier:
+                    # This side is a whole component of its own now
+                    old = labels[i]
+                    label = len(sizes)
+                    for node in seen:
+                        labels[node] = label
+                    sizes.append(len(seen))
+                    sizes[old] -= len(seen)
+                    return
+                for neighbor in self._linked(frontier.popleft()):
+                    if neighbor in other:
+                        return
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        frontier.append(neighbor)
+
+    def connected(self, i, j):
+        labels = self.components()
+        return labels[i] == labels[j]
+
+    def component_size(self, index):
+        labels = self.components()
+        return self._components[1][labels[index]]
+
+    def adjacent(self, index):
+        neighbors = self.neighbors
+        weights = self.weights
+        blocked = self.blocked
+        for slot in range(self.offsets[index], self.offsets[index + 1]):
+            if not blocked[slot]:
+                yield neighbors[slot], weights[slot]
+
+    def incoming(self, index):
+        sources = self.rev_sources
+        weights = self.weights
+        blocked = self.blocked
+        for k in range(self.rev_offsets[index], self.rev_offsets[index + 1]):
+            slot = self.rev_slots[k]
+            if not blocked[slot]:
+                yield sources[slot], weights[slot]
+
+    def edge_weight(self, i, j):
+        for slot in range(self.offsets[i], self.offsets[i + 1]):
+            if self.neighbors[slot] == j and not self.blocked[slot]:
+                return self.weights[slot]
+        return None
+
+    def distances_to(self, target):
+        # Reverse Dijkstra over open links: distance from every star to target
+        rev_offsets = self.rev_offsets
+        rev_slots = self.rev_slots
+        rev_sources = self.rev_sources
+        weights = self.weights
+        blocked = self.blocked
+
+        distances = array('d', [float('inf')]) * len(self)
+        distances[target] = 0
+        pq = [(0, target)]
+        while pq:
+            current_distance, current = heapq.heappop(pq)
+            if current_distance > distances[current]:
+                continue
+            for k in range(rev_offsets[current], rev_offsets[current + 1]):
+                slot = rev_slots[k]
+                if blocked[slot]:
+                    continue
+                source = rev_sources[slot]
+                new_distance = current_distance + weights[slot]
+                if new_distance < distances[source]:
+                    distances[source] = new_distance
+                    heapq.heappush(pq, (new_distance, source))
+        return distances
+
+    def path_to_ids(self, path):
+        ids = self.ids
+        return [ids[i] for i in path]
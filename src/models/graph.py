@@ -1,15 +1,50 @@
+from array import array
+from collections import deque
 from models.star import Star
 from models.constellation import Constellation
+from models.compiled_graph import CompiledGraph, edge_key
+from models.shortest_path_cache import ShortestPathCache
+from models.landmarks import LandmarkIndex
+from models.contraction_hierarchy import ContractionHierarchy
+from models.spatial_index import SpatialGrid
 
 class StarGraph:
     def __init__(self):
         self.constellations = []
         self.all_stars = {}
+        # Every star gets a dense integer index when it is added; ids only
+        # matter at the API boundary. Blocked links are keyed by edge_key of
+        # the two indices in blocked_keys; blocked_edges keeps the id pairs.
+        self.ids = []
+        self.star_indices = {}
         self.blocked_edges = set()
+        self.blocked_keys = set()
         self.galaxies = set()  
+        # Secondary indexes, kept up to date by add_constellation
+        self.star_constellation = {}
+        self.stars_by_galaxy = {}
+        self.hypergiants = []
+        self.hypergiants_by_galaxy = {}
+        self.spatial_index = SpatialGrid()
+        self._compiled = None
+        self.version = 0
+        # Stores behind the stars and their versions when the derived
+        # structures were last valid; see _sync_with_stores
+        self.stores = {}
+        self._store_versions = []
+        self.shortest_paths = ShortestPathCache(self)
+        self.landmarks = None
+        self.contraction_hierarchy = None
+        # File the map was loaded from; indexes built lazily are cached next to it
+        self.data_path = None
     
     def add_constellation(self, constellation):
+        constellation_index = len(self.constellations)
         self.constellations.append(constellation)
+        self._compiled = None
+        self.landmarks = None
+        self.contraction_hierarchy = None
+        self.version += 1
         
         for star in constellation.stars:
             star_id = str(star.id)
@@ -23,9 +58,99 @@ class StarGraph:
                 star.id = star_id
             
             self.all_stars[star_id] = star
+            self.stores.setdefault(id(star.store), star.store)
+            self.star_indices[star_id] = len(self.ids)
+            self.ids.append(star_id)
+            self.star_constellation.setdefault(star_id, constellation_index)
+            self.spatial_index.add(star, star.coordinates['x'], star.coordinates['y'])
          
             if hasattr(star, 'galaxy'):
                 self.galaxies.add(star.galaxy)
+            
+            galaxy = getattr(star, 'galaxy', 'Vía Láctea')
+            self.stars_by_galaxy.setdefault(galaxy, []).append(star)
+            if star.hypergiant:
+                self.hypergiants.append(star)
+                self.hypergiants_by_galaxy.setdefault(galaxy, []).append(star)
+        
+        # Links blocked before both of their stars were known
+        for edge in self.blocked_edges:
+            key = self._edge_key(*edge)
+            if key is not None:
+                self.blocked_keys.add(key)
+        self._store_versions = self._current_store_versions()
+    
+    def _current_store_versions(self):
+        return [store.version for store in self.stores.values()]
+    
+    def _sync_with_stores(self):
+        # Stars edited in place (research effect, time to eat, links...)
+        # invalidate the compiled snapshot and everything built on it, the
+        # same way adding a constellation does
+        versions = self._current_store_versions()
+        if versions != self._store_versions:
+            self._store_versions = versions
+            self._compiled = None
+            self.landmarks = None
+            self.contraction_hierarchy = None
+            self.version += 1
+    
+    def index_of(self, star_id):
+        index = self.star_indices.get(star_id)
+        if index is None and not isinstance(star_id, str):
+            index = self.star_indices.get(str(star_id))
+        return index
+    
+    def id_of(self, index):
+        return self.ids[index]
+    
+    def _edge_key(self, star1_id, star2_id):
+        i = self.index_of(star1_id)
+        j = self.index_of(star2_id)
+        if i is None or j is None:
+            return None
+        return edge_key(i, j)
+    
+    def get_compiled(self):
+        self._sync_with_stores()
+        if self._compiled is None:
+            self._compiled = CompiledGraph(self)
+        return self._compiled
+    
+    def prepare_landmarks(self, count=8, data_path=None):
+        # Reuses the index stored next to data_path when it still matches the
+        # graph; otherwise builds it and tries to store it there
+        compiled = self.get_compiled()
+        file_path = LandmarkIndex.path_for(data_path) if data_path else None
+        
+        index = LandmarkIndex.load(file_path, compiled) if file_path else None
+        if index is None:
+            index = LandmarkIndex.build(compiled, count)
+            if file_path:
+                try:
+                    index.save(file_path, compiled)
+                except OSError:
+                    pass
+        
+        self.landmarks = index
+        return index
+    
+    def prepare_contraction_hierarchy(self, data_path=None):
+        data_path = data_path or self.data_path
+        compiled = self.get_compiled()
+        file_path = ContractionHierarchy.path_for(data_path) if data_path else None
+        
+        hierarchy = ContractionHierarchy.load(file_path, compiled) if file_path else None
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.build(compiled)
+            if file_path:
+                try:
+                    hierarchy.save(file_path)
+                except OSError:
+                    pass
+        
+        self.contraction_hierarchy = hierarchy
+        return hierarchy
     
     def get_star_by_id(self, star_id):
         return self.all_stars.get(str(star_id))
@@ -33,43 +158,69 @@ class StarGraph:
     def get_all_stars(self):
         return list(self.all_stars.values())
     
+    def get_constellation_index(self, star_id):
+        return self.star_constellation.get(str(star_id))
+    
     def get_constellation_for_star(self, star_id):
-        star_id_str = str(star_id)
-        for constellation in self.constellations:
-            for star in constellation.stars:
-                if str(star.id) == star_id_str:
-                    return constellation
-        return None
+        index = self.star_constellation.get(str(star_id))
+        return self.constellations[index] if index is not None else None
     
     def get_stars_by_galaxy(self, galaxy):
-        return [star for star in self.all_stars.values() if getattr(star, 'galaxy', 'Vía Láctea') == galaxy]
+        return list(self.stars_by_galaxy.get(galaxy, ()))
     
     def get_hypergiant_stars(self, galaxy=None):
-        hypergiants = [star for star in self.all_stars.values() if star.hypergiant]
         if galaxy:
-            hypergiants = [star for star in hypergiants if getattr(star, 'galaxy', 'Vía Láctea') == galaxy]
-        return hypergiants
+            return list(self.hypergiants_by_galaxy.get(galaxy, ()))
+        return list(self.hypergiants)
     
     def get_stars_at_coordinates(self, x, y, tolerance=5):
-        stars_at_point = []
-        for star in self.all_stars.values():
-            if (abs(star.coordinates['x'] - x) <= tolerance and 
-                abs(star.coordinates['y'] - y) <= tolerance):
-                stars_at_point.append(star)
-        return stars_at_point
+        return self.spatial_index.at(x, y, tolerance)
+    
+    def get_stars_within(self, x, y, radius):
+        return self.spatial_index.within(x, y, radius)
+    
+    def get_stars_in_rect(self, x1, y1, x2, y2):
+        return self.spatial_index.in_rect(x1, y1, x2, y2)
+    
+    def get_nearest_stars(self, x, y, k=1):
+        return self.spatial_index.nearest(x, y, k)
     
     def block_edge(self, star1_id, star2_id):
+        self._sync_with_stores()
         edge = tuple(sorted([str(star1_id), str(star2_id)]))
+        if edge in self.blocked_edges:
+            return
         self.blocked_edges.add(edge)
+        self.version += 1
+        key = self._edge_key(star1_id, star2_id)
+        if key is not None:
+            self.blocked_keys.add(key)
+            if self._compiled is not None:
+                self._compiled.set_pair_blocked(key >> 32, key & 0xFFFFFFFF, True)
+        self.shortest_paths.on_edge_change(star1_id, star2_id, True)
     
     def unblock_edge(self, star1_id, star2_id):
+        self._sync_with_stores()
         edge = tuple(sorted([str(star1_id), str(star2_id)]))
         if edge in self.blocked_edges:
             self.blocked_edges.remove(edge)
+            self.version += 1
+            key = self._edge_key(star1_id, star2_id)
+            if key is not None:
+                self.blocked_keys.discard(key)
+                if self._compiled is not None:
+                    self._compiled.set_pair_blocked(key >> 32, key & 0xFFFFFFFF, False)
+            self.shortest_paths.on_edge_change(star1_id, star2_id, False)
+    
+    def clear_blocked_edges(self):
+        for star1_id, star2_id in list(self.blocked_edges):
+            self.unblock_edge(star1_id, star2_id)
     
     def is_edge_blocked(self, star1_id, star2_id):
-        edge = tuple(sorted([str(star1_id), str(star2_id)]))
-        return edge in self.blocked_edges
+        key = self._edge_key(star1_id, star2_id)
+        if key is None:
+            return tuple(sorted([str(star1_id), str(star2_id)])) in self.blocked_edges
+        return key in self.blocked_keys
     
     def get_adjacent_stars(self, star_id):
         star = self.get_star_by_id(star_id)
@@ -84,30 +235,49 @@ class StarGraph:
         
         return adjacent
     
+    def are_connected(self, star1_id, star2_id):
+        compiled = self.get_compiled()
+        i = compiled.star_index(star1_id)
+        j = compiled.star_index(star2_id)
+        if i is None or j is None:
+            return False
+        return compiled.connected(i, j)
+    
     def find_path_bfs(self, start_star_id, end_star_id=None):
-        start_star_id = str(start_star_id)
-        if end_star_id:
-            end_star_id = str(end_star_id)
+        compiled = self.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id) if end_star_id else None
+        if start is None:
+            return [] if end_star_id else [str(start_star_id)]
+        if end_star_id and end is None:
+            return []
+        if end is not None and not compiled.connected(start, end):
+            return []
         
-        visited = set()
-        queue = [(start_star_id, [start_star_id])]
+        # Stars are marked when queued and keep a parent pointer, so each one
+        # is queued once and only the returned path is ever built
+        parent = array('l', [-1]) * len(compiled)
+        visited = bytearray(len(compiled))
+        visited[start] = 1
+        queue = deque([start])
+        current = start
         
         while queue:
-            current_star_id, path = queue.pop(0)
-            
-            if end_star_id and current_star_id == end_star_id:
-                return path
-            
-            if current_star_id not in visited:
-                visited.add(current_star_id)
-                
-                adjacent_stars = self.get_adjacent_stars(current_star_id)
-                for neighbor_id, distance in adjacent_stars:
-                    if neighbor_id not in visited:
-                        new_path = path + [neighbor_id]
-                        queue.append((neighbor_id, new_path))
-            
-            if not end_star_id and len(visited) == len(self.all_stars):
+            current = queue.popleft()
+            if current == end:
                 break
+            
+            for neighbor, distance in compiled.adjacent(current):
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        else:
+            if end is not None:
+                return []
         
-        return path if not end_star_id else []
\ No newline at end of file
+        path = []
+        while current != -1:
+            path.append(current)
+            current = parent[current]
+        return compiled.path_to_ids(path[::-1])
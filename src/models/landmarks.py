@@ -0,0 +1,128 @@
+import heapq
+import json
+import os
+from array import array
+
+
+class LandmarkIndex:
+    # ALT preprocessing: distances from and to a few landmark stars, picked by
+    # farthest-point selection. By the triangle inequality
+    # d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L), which
+    # gives an admissible, consistent A* heuristic. Distances are computed
+    # with every link open, so blocking edges later (which can only make
+    # routes longer) keeps the bounds valid.
+    FILE_SUFFIX = ".landmarks.json"
+
+    def __init__(self, signature, landmarks, from_landmark, to_landmark):
+        self.signature = signature
+        self.landmarks = landmarks
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    @classmethod
+    def build(cls, compiled, count=8):
+        landmarks = []
+        from_landmark = []
+        to_landmark = []
+        if len(compiled) == 0:
+            return cls(compiled.signature(), landmarks, from_landmark, to_landmark)
+
+        # Seed with the star farthest from star 0 rather than star 0 itself
+        seed_distances = cls._distances(compiled, 0, reverse=False)
+        closest = [float('inf')] * len(compiled)
+        candidate = max(range(len(compiled)), key=lambda i: (seed_distances[i] < float('inf'), seed_distances[i]))
+
+        while len(landmarks) < min(count, len(compiled)):
+            landmarks.append(candidate)
+            forward = cls._distances(compiled, candidate, reverse=False)
+            backward = cls._distances(compiled, candidate, reverse=True)
+            from_landmark.append(forward)
+            to_landmark.append(backward)
+
+            for i in range(len(compiled)):
+                closest[i] = min(closest[i], forward[i])
+            for landmark in landmarks:
+                closest[landmark] = -1.0
+            # Farthest star the landmarks already reach; other components only
+            # get a landmark once this one is covered
+            candidate = max(range(len(compiled)), key=lambda i: (closest[i] < float('inf'), closest[i]))
+            if closest[candidate] <= 0:
+                unreached = next((i for i in range(len(compiled)) if closest[i] == float('inf')), None)
+                if unreached is None:
+                    break
+                # Seed the next component the same way as the first one
+                seed_distances = cls._distances(compiled, unreached, reverse=False)
+                candidate = max(range(len(compiled)), key=lambda i: (seed_distances[i] < float('inf'), seed_distances[i]))
+
+        return cls(compiled.signature(), landmarks, from_landmark, to_landmark)
+
+    @classmethod
+    def load(cls, file_path, compiled):
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('signature') != compiled.signature():
+            return None
+
+        def decode(rows):
+            return [array('d', [float('inf') if value is None else value for value in row]) for row in rows]
+
+        landmarks = [compiled.star_index(star_id) for star_id in data['landmarks']]
+        return cls(data['signature'], landmarks, decode(data['from']), decode(data['to']))
+
+    def save(self, file_path, compiled):
+        def encode(rows):
+            return [[None if value == float('inf') else value for value in row] for row in rows]
+
+        data = {
+            'signature': self.signature,
+            'landmarks': [compiled.star_id(landmark) for landmark in self.landmarks],
+            'from': encode(self.from_landmark),
+            'to': encode(self.to_landmark)
+        }
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+
+    @classmethod
+    def path_for(cls, data_path):
+        return os.path.splitext(data_path)[0] + cls.FILE_SUFFIX
+
+    def lower_bound(self, star, target):
+        bound = 0.0
+        for forward, backward in zip(self.from_landmark, self.to_landmark):
+            if forward[target] < float('inf') and forward[star] < float('inf'):
+                bound = max(bound, forward[target] - forward[star])
+            if backward[star] < float('inf') and backward[target] < float('inf'):
+                bound = max(bound, backward[star] - backward[target])
+        return bound
+
+    @staticmethod
+    def _distances(compiled, source, reverse):
+        if reverse:
+            offsets, slots = compiled.rev_offsets, compiled.rev_slots
+            ends = compiled.rev_sources
+        else:
+            offsets, slots = compiled.offsets, None
+            ends = compiled.neighbors
+        weights = compiled.weights
+
+        distances = array('d', [float('inf')]) * len(compiled)
+        distances[source] = 0
+        pq = [(0, source)]
+        while pq:
+            current_distance, current = heapq.heappop(pq)
+            if current_distance > distances[current]:
+                continue
+            for k in range(offsets[current], offsets[current + 1]):
+                slot = slots[k] if reverse else k
+                neighbor = ends[slot]
+                new_distance = current_distance + weights[slot]
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    heapq.heappush(pq, (new_distance, neighbor))
+        return distances
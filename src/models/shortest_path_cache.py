@@ -0,0 +1,190 @@
+import heapq
+from array import array
+from collections import OrderedDict
+from utils.constants import Constants
+
+
+class ShortestPathCache:
+    # Memoizes single-source shortest-path trees of a StarGraph. Trees are
+    # tagged with graph.version, which only block_edge, unblock_edge,
+    # add_constellation and in-place star edits bump, so repeated queries
+    # between edits just walk parent pointers. A tree is a pair of flat arrays (distance and parent
+    # per star, 16 bytes a star), and least recently used trees are evicted
+    # past max_trees. Unless max_trees is given it follows the graph size,
+    # so all trees together stay within Constants.SHORTEST_PATH_CACHE_MB.
+    #
+    # Blocking or unblocking a single edge does not throw the trees away:
+    # on_edge_change repairs each cached tree in place. A block only detaches
+    # the subtree hanging from the removed tree edge and re-settles those
+    # stars from their intact neighbours; an unblock only propagates the
+    # distance decreases the restored edge causes. Either way the work is
+    # proportional to the part of the tree that actually changes.
+    ALL_PAIRS_LIMIT = 2000
+
+    TREE_BYTES_PER_STAR = array('d').itemsize + array('l').itemsize
+
+    def __init__(self, graph, max_trees=None):
+        self.graph = graph
+        self.max_trees = max_trees
+        self.version = graph.version
+        self.trees = OrderedDict()
+
+    def clear(self):
+        self.trees.clear()
+        self.version = self.graph.version
+
+    def tree(self, source):
+        if self.version != self.graph.version:
+            self.clear()
+
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.trees.move_to_end(source)
+            return tree
+
+        tree = self._dijkstra(source)
+        self.trees[source] = tree
+        while len(self.trees) > self.tree_limit():
+            self.trees.popitem(last=False)
+        return tree
+
+    def tree_limit(self):
+        if self.max_trees is not None:
+            return self.max_trees
+        tree_bytes = max(1, len(self.graph.get_compiled())) * self.TREE_BYTES_PER_STAR
+        return max(1, Constants.SHORTEST_PATH_CACHE_MB * 2 ** 20 // tree_bytes)
+
+    def on_edge_change(self, star1_id, star2_id, blocked):
+        if not self.trees:
+            self.version = self.graph.version
+            return
+        if self.version != self.graph.version - 1:
+            self.clear()
+            return
+
+        compiled = self.graph.get_compiled()
+        i = compiled.star_index(star1_id)
+        j = compiled.star_index(star2_id)
+        if i is None or j is None:
+            self.version = self.graph.version
+            return
+
+        slots = compiled.slots_for(i, j)
+        for distances, previous in self.trees.values():
+            if blocked:
+                self._repair_block(compiled, distances, previous, i, j)
+            else:
+                self._repair_unblock(compiled, distances, previous, slots)
+        self.version = self.graph.version
+
+    def precompute_all_pairs(self):
+        # Only worth it on small graphs: one tree per star
+        compiled = self.graph.get_compiled()
+        if len(compiled) > self.ALL_PAIRS_LIMIT:
+            return False
+        self.max_trees = max(self.tree_limit(), len(compiled))
+        for source in range(len(compiled)):
+            self.tree(source)
+        return True
+
+    def distance(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        if start is None or end is None:
+            return float('inf')
+        distances, previous = self.tree(start)
+        return distances[end]
+
+    def route(self, start_star_id, end_star_id):
+        compiled = self.graph.get_compiled()
+        start = compiled.star_index(start_star_id)
+        end = compiled.star_index(end_star_id)
+        if start is None or end is None:
+            return []
+
+        distances, previous = self.tree(start)
+        if distances[end] == float('inf'):
+            return []
+
+        path = [end]
+        while previous[path[-1]] != -1:
+            path.append(previous[path[-1]])
+        return compiled.path_to_ids(path[::-1])
+
+    def _repair_block(self, compiled, distances, previous, i, j):
+        if previous[j] == i:
+            root = j
+        elif previous[i] == j:
+            root = i
+        else:
+            return
+
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        affected = [root]
+        detached = {root}
+        for node in affected:
+            for k in range(offsets[node], offsets[node + 1]):
+                child = neighbors[k]
+                if previous[child] == node and child not in detached:
+                    detached.add(child)
+                    affected.append(child)
+
+        for node in affected:
+            distances[node] = float('inf')
+            previous[node] = -1
+
+        pq = []
+        for node in affected:
+            for source, weight in compiled.incoming(node):
+                if source in detached:
+                    continue
+                new_distance = distances[source] + weight
+                if new_distance < distances[node]:
+                    distances[node] = new_distance
+                    previous[node] = source
+            if distances[node] < float('inf'):
+                pq.append((distances[node], node))
+        heapq.heapify(pq)
+        self._settle(compiled, distances, previous, pq)
+
+    def _repair_unblock(self, compiled, distances, previous, slots):
+        pq = []
+        for slot in slots:
+            source = compiled.rev_sources[slot]
+            target = compiled.neighbors[slot]
+            new_distance = distances[source] + compiled.weights[slot]
+            if new_distance < distances[target]:
+                distances[target] = new_distance
+                previous[target] = source
+                heapq.heappush(pq, (new_distance, target))
+        self._settle(compiled, distances, previous, pq)
+
+    def _settle(self, compiled, distances, previous, pq):
+        offsets = compiled.offsets
+        neighbors = compiled.neighbors
+        weights = compiled.weights
+        blocked = compiled.blocked
+
+        while pq:
+            current_distance, current = heapq.heappop(pq)
+            if current_distance > distances[current]:
+                continue
+            for k in range(offsets[current], offsets[current + 1]):
+                if blocked[k]:
+                    continue
+                neighbor = neighbors[k]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (new_distance, neighbor))
+
+    def _dijkstra(self, source):
+        compiled = self.graph.get_compiled()
+        distances = array('d', [float('inf')]) * len(compiled)
+        previous = array('l', [-1]) * len(compiled)
+        distances[source] = 0
+        self._settle(compiled, distances, previous, [(0, source)])
+        return distances, previous
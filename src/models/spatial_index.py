@@ -0,0 +1,127 @@
+import heapq
+import math
+
+
+class SpatialGrid:
+    # Uniform grid over (x, y) points, stored sparsely as a dict of cells.
+    # The cell size follows the bounding box so cells hold a few points on
+    # average; it is recomputed whenever the number of points has doubled
+    # since the last rebuild, which keeps inserts amortized O(1). Query
+    # results come back in insertion order, like the scans they replace.
+    POINTS_PER_CELL = 2
+
+    def __init__(self):
+        self.items = []
+        self.cells = {}
+        self.cell_size = 1.0
+        self.bounds = None
+        self._built_for = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item, x, y):
+        entry = (len(self.items), item, x, y)
+        self.items.append(entry)
+        if len(self.items) >= 2 * self._built_for:
+            self._rebuild()
+        else:
+            self._place(entry)
+
+    def _rebuild(self):
+        xs = [entry[2] for entry in self.items]
+        ys = [entry[3] for entry in self.items]
+        width = max(xs) - min(xs)
+        height = max(ys) - min(ys)
+        if width > 0 and height > 0:
+            self.cell_size = math.sqrt(width * height * self.POINTS_PER_CELL / len(self.items))
+        elif width > 0 or height > 0:
+            self.cell_size = max(width, height) * self.POINTS_PER_CELL / len(self.items)
+        self._built_for = len(self.items)
+        self.cells = {}
+        self.bounds = None
+        for entry in self.items:
+            self._place(entry)
+
+    def _place(self, entry):
+        cell = self._cell(entry[2], entry[3])
+        self.cells.setdefault(cell, []).append(entry)
+        if self.bounds is None:
+            self.bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            bounds = self.bounds
+            bounds[0] = min(bounds[0], cell[0])
+            bounds[1] = min(bounds[1], cell[1])
+            bounds[2] = max(bounds[2], cell[0])
+            bounds[3] = max(bounds[3], cell[1])
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _entries_in_rect(self, x1, y1, x2, y2):
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        found = []
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self.cells):
+            # Rectangles wider than the occupied grid: walk the cells instead
+            for (cx, cy), entries in self.cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    found.extend(entry for entry in entries
+                                 if x1 <= entry[2] <= x2 and y1 <= entry[3] <= y2)
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    for entry in self.cells.get((cx, cy), ()):
+                        if x1 <= entry[2] <= x2 and y1 <= entry[3] <= y2:
+                            found.append(entry)
+        found.sort()
+        return found
+
+    def in_rect(self, x1, y1, x2, y2):
+        return [entry[1] for entry in self._entries_in_rect(min(x1, x2), min(y1, y2),
+                                                            max(x1, x2), max(y1, y2))]
+
+    def at(self, x, y, tolerance=0):
+        # Points whose x and y are both within tolerance
+        return [entry[1] for entry in self._entries_in_rect(x - tolerance, y - tolerance,
+                                                            x + tolerance, y + tolerance)]
+
+    def within(self, x, y, radius):
+        return [entry[1] for entry in self._entries_in_rect(x - radius, y - radius, x + radius, y + radius)
+                if math.hypot(entry[2] - x, entry[3] - y) <= radius]
+
+    def nearest(self, x, y, k=1):
+        # k closest points, closest first (ties in insertion order). Rings of
+        # cells are scanned outwards until the k-th best is closer than any
+        # cell left to visit.
+        if not self.items or k <= 0:
+            return []
+        cx, cy = self._cell(x, y)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        last_ring = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+        best = []
+        ring = 0
+        while True:
+            if ring == 0:
+                ring_cells = [(cx, cy)]
+            else:
+                ring_cells = [(cx + dx, cy + dy) for dx in range(-ring, ring + 1)
+                              for dy in (-ring, ring)]
+                ring_cells += [(cx + dx, cy + dy) for dx in (-ring, ring)
+                               for dy in range(-ring + 1, ring)]
+            for cell in ring_cells:
+                for entry in self.cells.get(cell, ()):
+                    key = (-math.hypot(entry[2] - x, entry[3] - y), -entry[0])
+                    if len(best) < k:
+                        heapq.heappush(best, (key, entry[1]))
+                    elif key > best[0][0]:
+                        heapq.heapreplace(best, (key, entry[1]))
+            # Any point outside the scanned rings is at least this far away
+            reach = ring * self.cell_size
+            if len(best) == k and -best[0][0][0] < reach:
+                break
+            if ring >= last_ring:
+                break
+            ring += 1
+        return [item for _, item in sorted(best, reverse=True)]
+
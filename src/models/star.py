@@ -1,31 +1,229 @@
+import weakref
+from models.star_store import StarStore
+
+# Store shared by stars built outside a load; see Star.__init__
+_loose_store = None
+
+
+def _shared_store():
+    global _loose_store
+    if _loose_store is None:
+        _loose_store = StarStore()
+    return _loose_store
+
+
+class Coordinates(dict):
+    # {'x', 'y'} dict over the store's coordinate columns: reads come from
+    # the store and writes go to both, so it serializes like the plain dict
+    # it replaces and in-place edits are kept
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        super().__init__(x=store.number(row, 'x'), y=store.number(row, 'y'))
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key):
+        if key not in ('x', 'y'):
+            raise KeyError(key)
+        return self._store.number(self._row, key)
+
+    def __setitem__(self, key, value):
+        if key not in ('x', 'y'):
+            raise KeyError(key)
+        self._store.set_number(self._row, key, value)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class Link(dict):
+    # One {'starId', 'distance'} entry of linkedTo, backed by a link row
+    __slots__ = ('_store', '_link')
+
+    def __init__(self, store, link):
+        super().__init__(starId=store.link_targets[link], distance=store.distance(link))
+        self._store = store
+        self._link = link
+
+    def __setitem__(self, key, value):
+        if key == 'starId':
+            self._store.set_target(self._link, value)
+        elif key == 'distance':
+            self._store.set_distance(self._link, value)
+        else:
+            raise KeyError(key)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class Links(list):
+    # linkedTo as a list of Link entries. Edits to an entry write through
+    # to its link row; any change to the list itself rewrites the star's
+    # chain, after which the entries are Links to the new rows.
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        super().__init__(Link(store, link) for link in store.link_rows(row))
+        self._store = store
+        self._row = row
+
+    def _write_back(self):
+        for k, link in enumerate(self._store.set_links(self._row, self)):
+            list.__setitem__(self, k, Link(self._store, link))
+
+
+def _writes_back(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._write_back()
+        return result
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(Links, _name, _writes_back(_name))
+
+
 class Star:
-    def __init__(self, star_id, label, coordinates, radius, time_to_eat, 
-                 amount_of_energy, hypergiant=False, linked_to=None, research_effect=0, galaxy="Vía Láctea"):
-        self.id = str(star_id)
-        self.label = label
-        self.coordinates = coordinates
-        self.radius = radius
-        self.time_to_eat = time_to_eat
-        self.amount_of_energy = amount_of_energy
-        self.research_effect = research_effect 
-        self.hypergiant = hypergiant
-        self.linked_to = linked_to if linked_to else []
-        self.galaxy = galaxy
-        self.visited = False
-        self.blocked = False
-    
+    # Lightweight view of one row of a StarStore; all attributes read and
+    # write the store's columns. Loaders pass one store per map; stars
+    # created without one share a store and hand their row back to it when
+    # they are garbage collected.
+    __slots__ = ('_store', '_row', '__weakref__')
+
+    def __init__(self, star_id, label, coordinates, radius, time_to_eat,
+                 amount_of_energy, hypergiant=False, linked_to=None, research_effect=0, galaxy="Vía Láctea",
+                 store=None):
+        self._store = store if store is not None else _shared_store()
+        self._row = self._store.add(str(star_id), label, coordinates, radius, time_to_eat,
+                                    amount_of_energy, hypergiant, linked_to, research_effect, galaxy)
+        if store is None:
+            weakref.finalize(self, self._store.release, self._row)
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def id(self):
+        return self._store.ids[self._row]
+
+    @id.setter
+    def id(self, value):
+        self._store.ids[self._row] = value
+
+    @property
+    def label(self):
+        return self._store.labels[self._row]
+
+    @label.setter
+    def label(self, value):
+        self._store.labels[self._row] = value
+
+    @property
+    def coordinates(self):
+        return Coordinates(self._store, self._row)
+
+    @coordinates.setter
+    def coordinates(self, value):
+        self._store.set_coordinates(self._row, value)
+
+    @property
+    def radius(self):
+        return self._store.number(self._row, 'radius')
+
+    @radius.setter
+    def radius(self, value):
+        self._store.set_number(self._row, 'radius', value)
+
+    @property
+    def time_to_eat(self):
+        return self._store.number(self._row, 'time_to_eat')
+
+    @time_to_eat.setter
+    def time_to_eat(self, value):
+        self._store.set_number(self._row, 'time_to_eat', value)
+
+    @property
+    def amount_of_energy(self):
+        return self._store.number(self._row, 'amount_of_energy')
+
+    @amount_of_energy.setter
+    def amount_of_energy(self, value):
+        self._store.set_number(self._row, 'amount_of_energy', value)
+
+    @property
+    def research_effect(self):
+        return self._store.number(self._row, 'research_effect')
+
+    @research_effect.setter
+    def research_effect(self, value):
+        self._store.set_number(self._row, 'research_effect', value)
+
+    @property
+    def hypergiant(self):
+        return bool(self._store.hypergiant.item(self._row))
+
+    @hypergiant.setter
+    def hypergiant(self, value):
+        self._store.set_hypergiant(self._row, value)
+
+    @property
+    def galaxy(self):
+        return self._store.galaxy(self._row)
+
+    @galaxy.setter
+    def galaxy(self, value):
+        self._store.set_galaxy(self._row, value)
+
+    @property
+    def linked_to(self):
+        return Links(self._store, self._row)
+
+    @linked_to.setter
+    def linked_to(self, value):
+        self._store.set_links(self._row, value or [])
+
+    @property
+    def visited(self):
+        return self._store.flag(self._row, StarStore.VISITED)
+
+    @visited.setter
+    def visited(self, value):
+        self._store.set_flag(self._row, StarStore.VISITED, value)
+
+    @property
+    def blocked(self):
+        return self._store.flag(self._row, StarStore.BLOCKED)
+
+    @blocked.setter
+    def blocked(self, value):
+        self._store.set_flag(self._row, StarStore.BLOCKED, value)
+
     def add_connection(self, star_id, distance):
-        self.linked_to.append({'starId': str(star_id), 'distance': distance})
-    
+        self._store.add_link(self._row, str(star_id), distance)
+
     def remove_connection(self, star_id):
-        star_id_str = str(star_id)
-        self.linked_to = [conn for conn in self.linked_to if str(conn['starId']) != star_id_str]
-    
+        self._store.remove_links_to(self._row, star_id)
+
     def get_connections(self):
         return self.linked_to
-    
+
     def __str__(self):
         return f"Star {self.id} ({self.label}) at ({self.coordinates['x']}, {self.coordinates['y']}) - Galaxy: {self.galaxy}"
-    
+
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
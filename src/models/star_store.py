@@ -0,0 +1,238 @@
+import numpy as np
+
+
+class StarStore:
+    # Columnar storage behind Star. Numeric attributes live in one NumPy
+    # column each, indexed by row; ids, labels and galaxy names are plain
+    # lists (galaxies as small int codes). A flags byte per row remembers
+    # which numbers were given as ints, so views hand back the same types,
+    # plus the visited and blocked bits.
+    #
+    # Links form an edge table: each link row has its target id, distance
+    # and the next link of the same star, so a star's links are a chain
+    # from first_link to last_link in insertion order. Rewriting a star's
+    # links overwrites its rows in place; rows left over, removed links and
+    # the rows of released stars go on free lists and are reused first.
+    #
+    # Each load creates one store for its map. Stars built outside a load
+    # share one store and release their row when they are collected.
+    #
+    # version goes up with every write to a number, the hypergiant flag or a
+    # link, so a StarGraph can tell its compiled snapshot went stale when a
+    # star is edited in place.
+    NUMERIC = ('x', 'y', 'radius', 'time_to_eat', 'amount_of_energy', 'research_effect')
+    INT_BITS = {name: 1 << i for i, name in enumerate(NUMERIC)}
+    VISITED = 1 << len(NUMERIC)
+    BLOCKED = 1 << (len(NUMERIC) + 1)
+
+    def __init__(self, capacity=1024, link_capacity=4096):
+        self.size = 0
+        self.version = 0
+        self.free_rows = []
+        self.free_links = []
+        self.columns = {name: np.zeros(capacity) for name in self.NUMERIC}
+        self.hypergiant = np.zeros(capacity, dtype=bool)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.galaxy_codes = np.zeros(capacity, dtype=np.int32)
+        self.galaxies = []
+        self._galaxy_codes = {}
+        self.ids = []
+        self.labels = []
+
+        self.first_link = np.full(capacity, -1, dtype=np.int64)
+        self.last_link = np.full(capacity, -1, dtype=np.int64)
+        self.link_count = 0
+        self.link_targets = []
+        self.link_distance = np.zeros(link_capacity)
+        self.link_next = np.full(link_capacity, -1, dtype=np.int64)
+        self.link_is_int = np.zeros(link_capacity, dtype=bool)
+
+    def __len__(self):
+        return self.size - len(self.free_rows)
+
+    def add(self, star_id, label, coordinates, radius, time_to_eat, amount_of_energy,
+            hypergiant, linked_to, research_effect, galaxy):
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.ids[row] = star_id
+            self.labels[row] = label
+        else:
+            if self.size == len(self.flags):
+                self._grow_rows()
+            row = self.size
+            self.size += 1
+            self.ids.append(star_id)
+            self.labels.append(label)
+        self.first_link[row] = -1
+        self.last_link[row] = -1
+        self.flags[row] = 0
+        self.set_coordinates(row, coordinates)
+        self.set_number(row, 'radius', radius)
+        self.set_number(row, 'time_to_eat', time_to_eat)
+        self.set_number(row, 'amount_of_energy', amount_of_energy)
+        self.set_number(row, 'research_effect', research_effect)
+        self.set_hypergiant(row, hypergiant)
+        self.set_galaxy(row, galaxy)
+        for connection in linked_to or ():
+            self.add_link(row, connection['starId'], connection['distance'])
+        return row
+
+    def release(self, row):
+        # Frees a row whose star is gone, links included
+        self.free_links.extend(self.link_rows(row))
+        self.first_link[row] = -1
+        self.last_link[row] = -1
+        self.ids[row] = None
+        self.labels[row] = None
+        self.free_rows.append(row)
+
+    def _grow_rows(self):
+        capacity = 2 * len(self.flags)
+        for name in self.NUMERIC:
+            self.columns[name] = self._resized(self.columns[name], capacity, 0)
+        self.hypergiant = self._resized(self.hypergiant, capacity, False)
+        self.flags = self._resized(self.flags, capacity, 0)
+        self.galaxy_codes = self._resized(self.galaxy_codes, capacity, 0)
+        self.first_link = self._resized(self.first_link, capacity, -1)
+        self.last_link = self._resized(self.last_link, capacity, -1)
+
+    def _grow_links(self):
+        capacity = 2 * len(self.link_next)
+        self.link_distance = self._resized(self.link_distance, capacity, 0)
+        self.link_next = self._resized(self.link_next, capacity, -1)
+        self.link_is_int = self._resized(self.link_is_int, capacity, False)
+
+    @staticmethod
+    def _resized(column, capacity, fill):
+        grown = np.full(capacity, fill, dtype=column.dtype)
+        grown[:len(column)] = column
+        return grown
+
+    def number(self, row, name):
+        value = self.columns[name].item(row)
+        if self.flags.item(row) & self.INT_BITS[name]:
+            return int(value)
+        return value
+
+    def set_number(self, row, name, value):
+        self.version += 1
+        bit = self.INT_BITS[name]
+        self.columns[name][row] = value
+        if isinstance(value, int) and not isinstance(value, bool):
+            self.flags[row] |= bit
+        else:
+            self.flags[row] &= ~bit & 0xFF
+
+    def set_coordinates(self, row, coordinates):
+        self.set_number(row, 'x', coordinates['x'])
+        self.set_number(row, 'y', coordinates['y'])
+
+    def set_hypergiant(self, row, value):
+        self.version += 1
+        self.hypergiant[row] = bool(value)
+
+    def flag(self, row, bit):
+        return bool(self.flags.item(row) & bit)
+
+    def set_flag(self, row, bit, value):
+        if value:
+            self.flags[row] |= bit
+        else:
+            self.flags[row] &= ~bit & 0xFF
+
+    def galaxy(self, row):
+        return self.galaxies[self.galaxy_codes.item(row)]
+
+    def set_galaxy(self, row, galaxy):
+        code = self._galaxy_codes.get(galaxy)
+        if code is None:
+            code = self._galaxy_codes[galaxy] = len(self.galaxies)
+            self.galaxies.append(galaxy)
+        self.galaxy_codes[row] = code
+
+    def _new_link(self):
+        if self.free_links:
+            return self.free_links.pop()
+        if self.link_count == len(self.link_next):
+            self._grow_links()
+        self.link_count += 1
+        self.link_targets.append(None)
+        return self.link_count - 1
+
+    def add_link(self, row, target, distance):
+        link = self._new_link()
+        self.link_targets[link] = target
+        self.set_distance(link, distance)
+        self.link_next[link] = -1
+        last = self.last_link.item(row)
+        if last == -1:
+            self.first_link[row] = link
+        else:
+            self.link_next[last] = link
+        self.last_link[row] = link
+        return link
+
+    def link_rows(self, row):
+        # Link rows of a star, in insertion order
+        rows = []
+        link = self.first_link.item(row)
+        while link != -1:
+            rows.append(link)
+            link = self.link_next.item(link)
+        return rows
+
+    def distance(self, link):
+        value = self.link_distance.item(link)
+        return int(value) if self.link_is_int.item(link) else value
+
+    def set_target(self, link, target):
+        self.version += 1
+        self.link_targets[link] = target
+
+    def set_distance(self, link, value):
+        self.version += 1
+        self.link_distance[link] = value
+        self.link_is_int[link] = isinstance(value, int) and not isinstance(value, bool)
+
+    def set_links(self, row, linked_to):
+        # Read everything first: linked_to may be a view of these very rows
+        values = [(connection['starId'], connection['distance']) for connection in linked_to]
+        old = self.link_rows(row)
+        links = old[:len(values)]
+        links.extend(self._new_link() for _ in range(len(values) - len(links)))
+        self.free_links.extend(old[len(values):])
+
+        self.version += 1
+        previous = -1
+        for link, (target, distance) in zip(links, values):
+            self.link_targets[link] = target
+            self.set_distance(link, distance)
+            if previous == -1:
+                self.first_link[row] = link
+            else:
+                self.link_next[previous] = link
+            previous = link
+        if previous == -1:
+            self.first_link[row] = -1
+        else:
+            self.link_next[previous] = -1
+        self.last_link[row] = previous
+        return links
+
+    def remove_links_to(self, row, star_id):
+        self.version += 1
+        star_id = str(star_id)
+        previous = -1
+        link = self.first_link.item(row)
+        while link != -1:
+            following = self.link_next.item(link)
+            if str(self.link_targets[link]) == star_id:
+                if previous == -1:
+                    self.first_link[row] = following
+                else:
+                    self.link_next[previous] = following
+                self.free_links.append(link)
+            else:
+                previous = link
+            link = following
+        self.last_link[row] = previous
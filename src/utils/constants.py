@@ -24,6 +24,21 @@ class Constants:
     
     MAX_EATING_TIME_RATIO = 0.5
     
+    TRAVEL_COST_MULTIPLIERS = {
+        HEALTH_EXCELLENT: 0.5,
+        HEALTH_GOOD: 0.8,
+        HEALTH_POOR: 1.5,
+        HEALTH_DYING: 3.0,
+        HEALTH_DEAD: 0.0
+    }
+    
+    RESEARCH_COST_MULTIPLIERS = {
+        HEALTH_EXCELLENT: 0.7,
+        HEALTH_GOOD: 1.0,
+        HEALTH_POOR: 1.8,
+        HEALTH_DYING: 3.0
+    }
+    
 
     HEALTH_ENERGY_RATIOS = {
         HEALTH_EXCELLENT: 1.0,
@@ -33,4 +48,31 @@ class Constants:
         HEALTH_DEAD: 0.0
     }
     
+    MAX_STARS_TIME_BUDGET = 2.0  # seconds
+    # find_survivable_route from the window
+    SURVIVABLE_ROUTE_TIME_BUDGET = 5.0  # seconds
+    SURVIVABLE_ROUTE_LABEL_BUDGET = 500000
+    
+    # "cached", "bidirectional", "a_star", "alt" or "ch"
+    DEFAULT_ROUTE_STRATEGY = "cached"
+    LANDMARK_COUNT = 8
+    # Memory the cached shortest-path trees may take together
+    SHORTEST_PATH_CACHE_MB = 64
+    
+    # find_optimal_route: stars looked ahead per step and branches kept per level
+    OPTIMAL_ROUTE_LOOKAHEAD = 3
+    OPTIMAL_ROUTE_BEAM_WIDTH = 3
+    
+    # Components up to this size get the exact max-stars solver
+    EXACT_SOLVER_MAX_STARS = 22
+    EXACT_SOLVER_WARMUP_NODES = 2000
+    
+    # Share of a max-stars time/node budget the reachability map may use
+    REACHABILITY_BUDGET_SHARE = 0.5
+    
+    # improve_route: annealing islands, iterations per island per epoch
+    IMPROVER_ISLANDS = 4
+    IMPROVER_ITERATIONS = 2000
+    IMPROVER_TIME_BUDGET = 5.0  # seconds
+    
     DEATH_SOUND = "💀 ¡El burro ha muerto! 💀"
\ No newline at end of file
@@ -25,7 +25,7 @@ class FileLoader:
             raise FileLoadError(f"Error al cargar el archivo: {str(e)}")
     
     @staticmethod
-    def process_star_data(star_data, constellation_name, galaxy):
+    def process_star_data(star_data, constellation_name, galaxy, store=None):
         return Star(
             star_id=star_data['id'],
             label=star_data['label'],
@@ -36,5 +36,6 @@ class FileLoader:
             research_effect=star_data.get('researchEffect', 0),
             hypergiant=star_data.get('hypergiant', False),
             linked_to=star_data['linkedTo'],
-            galaxy=galaxy 
+            galaxy=galaxy,
+            store=store
         )
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+from models.constellation import Constellation
+from models.graph import StarGraph
+from models.star_store import StarStore
+from utils.file_loader import FileLoader
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'constellations.json')
+
+
+def load_graph(path=DATA_PATH):
+    # Same shape as MainWindow.process_constellation_data: one store per load
+    data = FileLoader.load_constellations(path)
+    graph = StarGraph()
+    store = StarStore()
+    for constellation_data in data['constellations']:
+        constellation = Constellation(constellation_data['name'])
+        galaxy = constellation_data.get('galaxy', 'Vía Láctea')
+        for star_data in constellation_data['starts']:
+            constellation.add_star(FileLoader.process_star_data(star_data, constellation_data['name'],
+                                                                galaxy, store=store))
+        graph.add_constellation(constellation)
+    return graph
@@ -0,0 +1,53 @@
+import copy
+from collections import deque
+from algorithms.path_finder import PathFinder
+from models.burro import Burro
+from helpers import load_graph
+
+PARAMS = [
+    ('Excelente', 12, 100, 300, 3567),
+    ('Buena', 12, 60, 5, 800),
+    ('Mala', 12, 30, 1, 400),
+]
+
+
+def reference_max_stars(graph, start_id, initial_health, initial_age, initial_energy, initial_grass, death_age):
+    # Plain FIFO search over every simple route, like the original planner
+    burro = Burro(initial_health, initial_energy, initial_grass, initial_age, death_age)
+    best = [start_id]
+    queue = deque([(start_id, [start_id], burro)])
+    while queue:
+        star_id, route, current = queue.popleft()
+        if len(route) > len(best):
+            best = route
+        for neighbor_id, distance in graph.get_adjacent_stars(star_id):
+            if neighbor_id in route:
+                continue
+            moved = copy.deepcopy(current)
+            if not moved.travel(distance) or moved.is_dead():
+                continue
+            neighbor = graph.get_star_by_id(neighbor_id)
+            moved.visit_star(neighbor, neighbor.time_to_eat * 0.5)
+            if not moved.is_dead():
+                queue.append((neighbor_id, route + [neighbor_id], moved))
+    return best
+
+
+def assert_matches_reference(graph):
+    finder = PathFinder(graph)
+    for start_id in graph.all_stars:
+        for params in PARAMS:
+            route = finder.find_max_stars_route(start_id, *params)
+            assert route == reference_max_stars(graph, start_id, *params), (start_id, params)
+
+
+def test_max_stars_matches_reference():
+    assert_matches_reference(load_graph())
+
+
+def test_max_stars_matches_reference_with_blocked_links():
+    graph = load_graph()
+    for star_id in ('1', '4', '7'):
+        star = graph.get_star_by_id(star_id)
+        graph.block_edge(star_id, str(star.linked_to[0]['starId']))
+    assert_matches_reference(graph)
@@ -0,0 +1,57 @@
+from algorithms.path_finder import PathFinder
+from helpers import load_graph
+
+
+def set_research_effects(graph, effect):
+    for star in graph.all_stars.values():
+        star.research_effect = effect
+
+
+def test_max_stars_replans_after_research_edit():
+    graph = load_graph()
+    finder = PathFinder(graph)
+    set_research_effects(graph, -50)
+    finder.find_max_stars_route_anytime('1', 'Excelente', 12, 100, 300, 200)
+
+    set_research_effects(graph, 300)
+    edited = finder.find_max_stars_route_anytime('1', 'Excelente', 12, 100, 300, 200)
+
+    fresh_graph = load_graph()
+    set_research_effects(fresh_graph, 300)
+    fresh = PathFinder(fresh_graph).find_max_stars_route_anytime('1', 'Excelente', 12, 100, 300, 200)
+    assert edited == fresh
+    assert len(edited[0]) > 2
+
+
+def test_optimal_route_replans_after_time_to_eat_edit():
+    graph = load_graph()
+    finder = PathFinder(graph)
+    before = finder.find_optimal_route('1', 'Excelente', 100, 300, 'Excelente')
+    graph.get_star_by_id('2').time_to_eat = 60
+
+    fresh_graph = load_graph()
+    fresh_graph.get_star_by_id('2').time_to_eat = 60
+    after = finder.find_optimal_route('1', 'Excelente', 100, 300, 'Excelente')
+    assert after != before
+    assert after == PathFinder(fresh_graph).find_optimal_route('1', 'Excelente', 100, 300, 'Excelente')
+
+
+def test_link_edit_reaches_route_search():
+    graph = load_graph()
+    finder = PathFinder(graph)
+    assert finder.find_route_to_destination('1', '4') == ['1', '4']
+    star = graph.get_star_by_id('1')
+    for connection in star.linked_to:
+        if str(connection['starId']) == '4':
+            connection['distance'] = 10000
+    assert finder.find_route_to_destination('1', '4') != ['1', '4']
+
+
+def test_rewriting_links_reuses_rows():
+    graph = load_graph()
+    star = graph.get_star_by_id('1')
+    store = star.store
+    link_count = store.link_count
+    for k in range(1000):
+        star.linked_to.sort(key=lambda connection: connection['distance'], reverse=k % 2 == 0)
+    assert store.link_count == link_count